@@ -7,9 +7,15 @@ from pytgcalls.exceptions import NoActiveGroupCall
 import config
 from AnonMusic import LOGGER, app, userbot
 from AnonMusic.core.call import Anony
+from AnonMusic.core.http import http
 from AnonMusic.misc import sudo
 from AnonMusic.plugins import ALL_MODULES
 from AnonMusic.utils.database import get_banned_users, get_gbanned
+from AnonMusic.utils.health import start_health_server
+from AnonMusic.utils.load import Load
+from AnonMusic.utils.quality import Quality
+from AnonMusic.utils.stall import Stalls
+from AnonMusic.utils.watchdog import Watchdog
 from config import BANNED_USERS, COOKIES_URL
 from AnonMusic.plugins.sudo.cookies import set_cookies
 
@@ -33,6 +39,10 @@ async def init():
             BANNED_USERS.add(user_id)
     except:
         pass
+    await http.start()
+    Load.start()
+    Watchdog.start()
+    health = await start_health_server()
     await app.start()
     for all_module in ALL_MODULES:
         importlib.import_module("AnonMusic.plugins" + all_module)
@@ -52,8 +62,13 @@ async def init():
     res = await set_cookies(COOKIES_URL)
     LOGGER("AnonMusic").info(f"{res}")
     await Anony.decorators()
+    Quality.start(Anony.apply_quality)
+    Stalls.start(Anony)
     await idle()
     await app.stop()
+    if health:
+        await health.cleanup()
+    await http.close()
     LOGGER("AnonMusic").info("🚫 Stopping AnonX Music Bot...")
 
 
@@ -1,40 +1,52 @@
 import asyncio
 import os
+import re
+import time
 from datetime import datetime, timedelta
 from typing import Union
+from urllib.parse import urlsplit
 
 from pyrogram import Client
 from pyrogram.types import InlineKeyboardMarkup
 from pytgcalls import PyTgCalls
 from pytgcalls.exceptions import (
-    NoActiveGroupCall
+    NoActiveGroupCall,
+    NoAudioSourceFound,
+    NoVideoSourceFound,
 )
 from ntgcalls import TelegramServerError
 from pytgcalls.types import Update, StreamEnded
 from pytgcalls import filters as fl
-from pytgcalls.types import AudioQuality, VideoQuality
 from pytgcalls.types import MediaStream,ChatUpdate
 
 import config
-from config import autoclean
-from AnonMusic import LOGGER, YouTube, app
+from config import autoclean, time_to_seconds
+from AnonMusic import LOGGER, Telegram, YouTube, app
+from AnonMusic.core.metrics import Counter
 from AnonMusic.misc import db
 from AnonMusic.utils.database import (
     add_active_chat,
     add_active_video_chat,
+    get_active_chats,
     get_lang,
     get_loop,
     group_assistant,
+    is_active_video_chat,
     is_autoend,
+    is_music_playing,
     music_on,
     remove_active_chat,
     remove_active_video_chat,
     set_loop,
 )
 from AnonMusic.utils.exceptions import AssistantErr
-from AnonMusic.utils.formatters import check_duration, seconds_to_min, speed_converter
+from AnonMusic.utils.formatters import seconds_to_min
 from AnonMusic.utils.inline.play import stream_markup
+from AnonMusic.utils.outbound import PLAYBACK, REPLY, Outbound
+from AnonMusic.utils.quality import Quality
 from AnonMusic.utils.thumbnails import get_thumb
+from AnonMusic.utils.tracing import traced
+from AnonMusic.utils.transcode import Jobs
 from strings import get_string
 
 #=×=×=×=×=×=×=×=×=×=×=×=×=×=×=×=×[ NO NEED COOKIES ]=×=×=×=×=×=×=×=×=×=×=×=×=×=×=×=×=×=×=×=×=×=×=×
@@ -57,10 +69,92 @@ def cookie_txt_file():
 
 autoend = {}
 counter = {}
+refreshers = {}
+following = {}
+
+LIVE_REFRESHES = Counter(
+    "anon_live_refreshes_total", "Live stream URLs resolved again before expiry", ("result",)
+)
+
+
+def speed_parameters(speed, start: int = 0) -> str:
+    """
+    ffmpeg flags that play a source from ``start`` seconds at ``speed``.
+
+    Video timestamps are rescaled on input and audio goes through atempo
+    after pytgcalls' own output options, so nothing is re-encoded to disk.
+    """
+    speed = float(speed)
+    params = f"-ss {start}"
+    if speed != 1.0:
+        params += f" -itsscale:v {1 / speed:.4f} -atend -filter:a atempo={speed}"
+    return params
+
+
+def _remote_kind(link: str) -> str:
+    parts = urlsplit(link)
+    host = (parts.hostname or "").lower()
+    path = parts.path.lower()
+    if host.endswith("googlevideo.com"):
+        return "live" if host.startswith("manifest.") or ".m3u8" in path else "youtube"
+    if host.endswith("sndcdn.com") or "soundcloud" in host:
+        return "soundcloud"
+    return "index"
+
+
+def input_parameters(link):
+    """
+    ffmpeg input flags for ``link``, or None for local files.
+
+    Remote sources reconnect on dropped connections and get larger probe
+    and packet buffers, tuned per source: progressive YouTube files may
+    seek on reconnect, live playlists keep refreshing at EOF and start a
+    few segments back, and m3u8/index URLs probe longer.
+    """
+    if not isinstance(link, str) or not link.startswith(("http://", "https://")):
+        return None
+    kind = _remote_kind(link)
+    params = [
+        "-reconnect 1",
+        "-reconnect_streamed 1",
+        "-reconnect_on_network_error 1",
+        f"-reconnect_delay_max {config.REMOTE_RECONNECT_DELAY_MAX}",
+        f"-rw_timeout {int(config.REMOTE_RW_TIMEOUT * 1000000)}",
+        f"-thread_queue_size {config.REMOTE_QUEUE_SIZE}",
+    ]
+    if kind == "live":
+        params += ["-reconnect_at_eof 1", "-live_start_index -3"]
+    else:
+        params.append("-reconnect_on_http_error 5xx")
+    if kind in ("youtube", "index"):
+        params += [
+            f"-probesize {config.REMOTE_PROBESIZE}",
+            f"-analyzeduration {config.REMOTE_ANALYZEDURATION}",
+        ]
+    return " ".join(params)
+
+
+def _refresh_delay(link: str) -> float:
+    """Seconds until ``link`` should be resolved again, from its ``expire`` field."""
+    match = re.search(r"expire[/=](\d+)", link)
+    if not match:
+        return config.LIVE_REFRESH_INTERVAL
+    delay = int(match.group(1)) - time.time() - config.LIVE_REFRESH_MARGIN
+    return max(delay, config.LIVE_REFRESH_MIN)
+
+
+def _stop_refresh(chat_id):
+    task = refreshers.pop(chat_id, None)
+    if task and task is not asyncio.current_task():
+        task.cancel()
 
 
 async def _clear_(chat_id):
     db[chat_id] = []
+    _stop_refresh(chat_id)
+    following.pop(chat_id, None)
+    Jobs.cancel_chat(chat_id)
+    Quality.applied.pop(chat_id, None)
     await remove_active_video_chat(chat_id)
     await remove_active_chat(chat_id)
 
@@ -125,6 +219,7 @@ class Call(PyTgCalls):
     async def resume_stream(self, chat_id: int):
         assistant = await group_assistant(self, chat_id)
         await assistant.resume(chat_id)
+        await self.apply_chat_quality(chat_id)
 
     async def stop_stream(self, chat_id: int):
         assistant = await group_assistant(self, chat_id)
@@ -165,61 +260,212 @@ class Call(PyTgCalls):
         except:
             pass
 
-    async def speedup_stream(self, chat_id: int, file_path, speed, playing):
+    async def _build_stream(
+        self, chat_id: int, link, video=None, ffmpeg_parameters=None, refresh=True, live=None
+    ):
+        """
+        The MediaStream for ``link`` at the chat's current quality.
+
+        ``live`` says whether ``link`` is a live manifest whose URL must be
+        kept fresh; when None it is read from the chat's current queue entry.
+        """
+        audio_parameters, video_parameters = await Quality.parameters(chat_id)
+        following.pop(chat_id, None)
+        remote = input_parameters(link)
+        if refresh:
+            _stop_refresh(chat_id)
+            if live is None:
+                playing = db.get(chat_id)
+                live = bool(playing) and "live_" in str(playing[0]["file"])
+            if remote and live and (config.LIVE_REFRESH_INTERVAL or "expire" in link):
+                refreshers[chat_id] = asyncio.create_task(
+                    self._refresh_live(chat_id, link, video)
+                )
+        if remote:
+            ffmpeg_parameters = f"{remote} {ffmpeg_parameters}" if ffmpeg_parameters else remote
+        if video:
+            return MediaStream(
+                link,
+                audio_parameters=audio_parameters,
+                video_parameters=video_parameters,
+                ffmpeg_parameters=ffmpeg_parameters,
+            )
+        return MediaStream(
+            link,
+            audio_parameters=audio_parameters,
+            video_flags=MediaStream.Flags.IGNORE,
+            ffmpeg_parameters=ffmpeg_parameters,
+        )
+
+    async def _refresh_live(self, chat_id: int, link: str, video):
+        """
+        Keep a live stream's manifest URL fresh while it plays.
+
+        YouTube live URLs stop working at their ``expire`` time, so shortly
+        before that the URL is resolved again and swapped into the call.
+        Paused calls and failed lookups are retried every
+        ``LIVE_REFRESH_RETRY`` seconds.
+        """
+        delay = _refresh_delay(link)
+        while True:
+            await asyncio.sleep(delay)
+            playing = db.get(chat_id)
+            if not playing or "live_" not in str(playing[0]["file"]):
+                break
+            delay = config.LIVE_REFRESH_RETRY
+            if not await is_music_playing(chat_id):
+                continue
+            try:
+                n, new = await YouTube.video(playing[0]["vidid"], True)
+                if n == 0:
+                    raise Exception(new)
+                stream = await self._build_stream(chat_id, new, video, refresh=False)
+                assistant = await group_assistant(self, chat_id)
+                await assistant.play(chat_id, stream)
+            except Exception as e:
+                LIVE_REFRESHES.inc(result="failed")
+                LOGGER(__name__).warning(f"Failed to refresh live stream in {chat_id}: {e}")
+                continue
+            LIVE_REFRESHES.inc(result="ok")
+            link = new
+            delay = _refresh_delay(link)
+        if refreshers.get(chat_id) is asyncio.current_task():
+            refreshers.pop(chat_id, None)
+
+    async def apply_quality(self):
+        """
+        Rebuild streams whose quality tier changed, at their current position.
+
+        Only tracks playing from a local file are restarted; URL and live
+        streams switch tier with their next track. Paused calls are left
+        alone until they resume.
+        """
+        for chat_id in list(await get_active_chats()):
+            if await self.apply_chat_quality(chat_id):
+                await asyncio.sleep(config.QUALITY_RESTART_GAP)
+
+    async def apply_chat_quality(self, chat_id: int) -> bool:
+        """Rebuild ``chat_id``'s stream if its tier changed; True if it was restarted."""
+        playing = db.get(chat_id)
+        if not playing or Quality.applied.get(chat_id) == await Quality.tier(chat_id):
+            return False
+        if not await is_music_playing(chat_id):
+            return False
+        file_path = playing[0]["file"]
+        if not isinstance(file_path, str) or not os.path.isfile(file_path):
+            return False
+        speed = playing[0].get("speed") or 1.0
+        position = int(playing[0]["played"] * float(speed))
+        try:
+            assistant = await group_assistant(self, chat_id)
+            stream = await self._build_stream(
+                chat_id,
+                file_path,
+                playing[0]["streamtype"] == "video",
+                speed_parameters(speed, position),
+            )
+            await assistant.play(chat_id, stream)
+        except Exception as e:
+            LOGGER(__name__).warning(f"Failed to change quality in {chat_id}: {e}")
+        return True
+
+    async def played_time(self, chat_id: int):
+        """Seconds pytgcalls has streamed of the current track, or None if unknown."""
         assistant = await group_assistant(self, chat_id)
-        if str(speed) != str("1.0"):
-            base = os.path.basename(file_path)
-            chatdir = os.path.join(os.getcwd(), "playback", str(speed))
-            if not os.path.isdir(chatdir):
-                os.makedirs(chatdir)
-            out = os.path.join(chatdir, base)
-            if not os.path.isfile(out):
-                if str(speed) == str("0.5"):
-                    vs = 2.0
-                if str(speed) == str("0.75"):
-                    vs = 1.35
-                if str(speed) == str("1.5"):
-                    vs = 0.68
-                if str(speed) == str("2.0"):
-                    vs = 0.5
-                proc = await asyncio.create_subprocess_shell(
-                    cmd=(
-                        "ffmpeg "
-                        "-i "
-                        f"{file_path} "
-                        "-filter:v "
-                        f"setpts={vs}*PTS "
-                        "-filter:a "
-                        f"atempo={speed} "
-                        f"{out}"
-                    ),
-                    stdin=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE,
+        for name in ("time", "played_time"):
+            method = getattr(assistant, name, None)
+            if method:
+                try:
+                    return await method(chat_id)
+                except Exception:
+                    return None
+        return None
+
+    async def recover_stream(self, chat_id: int, position: int) -> bool:
+        """Re-resolve the current track's source and restart it at ``position``."""
+        playing = db.get(chat_id)
+        if not playing:
+            return False
+        track = playing[0]
+        file_path = track["file"]
+        video = track["streamtype"] == "video"
+        params = follow = None
+        if "live_" in file_path:
+            n, link = await YouTube.video(track["vidid"], True)
+            if n == 0:
+                return False
+        else:
+            if "vid_" in file_path:
+                link, _ = await YouTube.download(
+                    track["vidid"], None, videoid=True, video=video, chat_id=chat_id
                 )
-                await proc.communicate()
+            elif "index_" in file_path:
+                link = track["vidid"]
             else:
-                pass
-        else:
-            out = file_path
-        dur = await asyncio.get_event_loop().run_in_executor(None, check_duration, out)
-        dur = int(dur)
-        played, con_seconds = speed_converter(playing[0]["played"], speed)
-        duration = seconds_to_min(dur)
-        stream = (
-            MediaStream(
-                out,
-                audio_parameters=AudioQuality.HIGH,
-                video_parameters=VideoQuality.SD_480p,
-                ffmpeg_parameters=f"-ss {played} -to {duration}",
+                link, follow = Telegram.source(file_path)
+            params = speed_parameters(track.get("speed") or 1.0, position)
+            if follow:
+                params = f"{follow} {params}"
+        stream = await self._build_stream(chat_id, link, video, params)
+        assistant = await group_assistant(self, chat_id)
+        await assistant.play(chat_id, stream)
+        if follow:
+            self._follow(chat_id, file_path)
+        return True
 
+    def _follow(self, chat_id: int, path):
+        following[chat_id] = path
+        asyncio.create_task(self._finish_follow(chat_id, path))
+
+    async def _finish_follow(self, chat_id: int, path):
+        """
+        Move a stream reading a downloading ``.part`` file onto the finished file.
+
+        ``-follow`` never lets ffmpeg see the end of the partial file, so once
+        the download completes the track is reopened from the final file at
+        the current position and ends normally.
+        """
+        try:
+            await Telegram.wait(path)
+        except Exception:
+            return
+        if following.get(chat_id) != path or not os.path.exists(path):
+            return
+        following.pop(chat_id, None)
+        playing = db.get(chat_id)
+        if playing and playing[0]["file"] == path:
+            speed = playing[0].get("speed") or 1.0
+            position = int(playing[0]["played"] * float(speed))
+            video = playing[0]["streamtype"] == "video"
+        else:
+            # The queue entry is written right after join_call returns.
+            speed = 1.0
+            position = int(await self.played_time(chat_id) or 0)
+            video = await is_active_video_chat(chat_id)
+        try:
+            paused = not await is_music_playing(chat_id)
+            stream = await self._build_stream(
+                chat_id, path, video, speed_parameters(speed, position)
             )
-            if playing[0]["streamtype"] == "video"
-            else MediaStream(
-                out,
-                audio_parameters=AudioQuality.HIGH,
-                ffmpeg_parameters=f"-ss {played} -to {duration}",
-                video_flags=MediaStream.Flags.IGNORE
-            )
+            assistant = await group_assistant(self, chat_id)
+            await assistant.play(chat_id, stream)
+            if paused:
+                await assistant.pause(chat_id)
+        except Exception as e:
+            LOGGER(__name__).warning(f"Failed to reopen finished download in {chat_id}: {e}")
+
+    async def speedup_stream(self, chat_id: int, file_path, speed, playing):
+        assistant = await group_assistant(self, chat_id)
+        current = float(playing[0].get("speed") or 1.0)
+        position = int(playing[0]["played"] * current)
+        dur = int(int(playing[0].get("old_second") or playing[0]["seconds"]) / float(speed))
+        duration = seconds_to_min(dur)
+        con_seconds = int(position / float(speed))
+        stream = await self._build_stream(
+            chat_id,
+            file_path,
+            playing[0]["streamtype"] == "video",
+            speed_parameters(speed, position),
         )
         if str(db[chat_id][0]["file"]) == str(file_path):
             await assistant.play(chat_id, stream)
@@ -233,7 +479,6 @@ class Call(PyTgCalls):
             db[chat_id][0]["played"] = con_seconds
             db[chat_id][0]["dur"] = duration
             db[chat_id][0]["seconds"] = dur
-            db[chat_id][0]["speed_path"] = out
             db[chat_id][0]["speed"] = speed
 
     async def force_stop_stream(self, chat_id: int):
@@ -258,47 +503,30 @@ class Call(PyTgCalls):
         image: Union[bool, str] = None,
     ):
         assistant = await group_assistant(self, chat_id)
-        if video:
-            stream = MediaStream(
-                link,
-                audio_parameters=AudioQuality.HIGH,
-                video_parameters=VideoQuality.SD_480p,
-            )
-        else:
-            stream = MediaStream(link, audio_parameters=AudioQuality.HIGH,video_flags=MediaStream.Flags.IGNORE)
+        stream = await self._build_stream(chat_id, link, video)
         await assistant.play(
             chat_id,
             stream,
         )
 
-    async def seek_stream(self, chat_id, file_path, to_seek, duration, mode):
+    async def seek_stream(self, chat_id, file_path, to_seek, duration, mode, speed=None):
         assistant = await group_assistant(self, chat_id)
-        stream = (
-            MediaStream(
-                file_path,
-                audio_parameters=AudioQuality.HIGH,
-                video_parameters=VideoQuality.SD_480p,
-                ffmpeg_parameters=f"-ss {to_seek} -to {duration}",
-            )
-            if mode == "video"
-            else MediaStream(
-                file_path,
-                audio_parameters=AudioQuality.HIGH,
-                video_flags=MediaStream.Flags.IGNORE,
-                ffmpeg_parameters=f"-ss {to_seek} -to {duration}",
-            )
-        )
+        params = f"-ss {to_seek} -to {duration}"
+        if speed and float(speed) != 1.0:
+            params = speed_parameters(speed, int(time_to_seconds(to_seek) * float(speed)))
+        stream = await self._build_stream(chat_id, file_path, mode == "video", params)
         await assistant.play(chat_id, stream)
 
     async def stream_call(self, link):
         assistant = await group_assistant(self, config.LOGGER_ID)
         await assistant.play(
             config.LOGGER_ID,
-            MediaStream(link)
+            MediaStream(link, ffmpeg_parameters=input_parameters(link))
         )
         await asyncio.sleep(0.2)
         await assistant.leave_call(config.LOGGER_ID)
 
+    @traced("join_call")
     async def join_call(
         self,
         chat_id: int,
@@ -306,27 +534,14 @@ class Call(PyTgCalls):
         link,
         video: Union[bool, str] = None,
         image: Union[bool, str] = None,
+        live: bool = False,
     ):
         assistant = await group_assistant(self, chat_id)
         language = await get_lang(chat_id)
         _ = get_string(language)
-        if video:
-            stream= MediaStream(
-                link,
-                audio_parameters=AudioQuality.HIGH,video_parameters=VideoQuality.SD_480p
-                )
-
-        else:
-            stream = (
-                MediaStream(
-                    link,
-                    audio_parameters=AudioQuality.HIGH,
-                    video_parameters=VideoQuality.SD_480p,
-                    
-                )
-                if video
-                else MediaStream(link, audio_parameters=AudioQuality.HIGH,video_flags=MediaStream.Flags.IGNORE)
-            )
+        path = link
+        link, follow = Telegram.source(link)
+        stream = await self._build_stream(chat_id, link, video, follow, live=live)
         try:
             await assistant.play(
                 chat_id,
@@ -337,6 +552,14 @@ class Call(PyTgCalls):
             raise AssistantErr(_["call_8"])
         except TelegramServerError:
             raise AssistantErr(_["call_10"])
+        except (NoAudioSourceFound, NoVideoSourceFound):
+            if not follow or not Telegram.downloading(path):
+                raise
+            # Files whose index sits at the end cannot be probed while partial.
+            await Telegram.wait(path)
+            return await self.join_call(chat_id, original_chat_id, path, video, image)
+        if follow:
+            self._follow(chat_id, path)
         await add_active_chat(chat_id)
         await music_on(chat_id)
         if video:
@@ -384,38 +607,35 @@ class Call(PyTgCalls):
             if exis:
                 db[chat_id][0]["dur"] = exis
                 db[chat_id][0]["seconds"] = check[0]["old_second"]
-                db[chat_id][0]["speed_path"] = None
                 db[chat_id][0]["speed"] = 1.0
             video = True if str(streamtype) == "video" else False
             if "live_" in queued:
                 n, link = await YouTube.video(videoid, True)
                 if n == 0:
-                    return await app.send_message(
+                    return await Outbound.send(
+                        REPLY,
+                        original_chat_id,
+                        app.send_message,
                         original_chat_id,
                         text=_["call_6"],
                     )
-                if video:
-                    stream = MediaStream(
-                        link,
-                        audio_parameters=AudioQuality.HIGH,
-                        video_parameters=VideoQuality.SD_480p,
-                    )
-                else:
-                    stream = MediaStream(
-                        link,
-                        audio_parameters=AudioQuality.HIGH,
-                        video_flags=MediaStream.Flags.IGNORE
-                    )
+                stream = await self._build_stream(chat_id, link, video)
                 try:
                     await client.play(chat_id, stream)
                 except Exception:
-                    return await app.send_message(
+                    return await Outbound.send(
+                        REPLY,
+                        original_chat_id,
+                        app.send_message,
                         original_chat_id,
                         text=_["call_6"],
                     )
                 img = await get_thumb(videoid)
                 button = stream_markup(_, chat_id)
-                run = await app.send_photo(
+                run = await Outbound.send(
+                    PLAYBACK,
+                    original_chat_id,
+                    app.send_photo,
                     chat_id=original_chat_id,
                     photo=img,
                     caption=_["stream_1"].format(
@@ -429,41 +649,39 @@ class Call(PyTgCalls):
                 db[chat_id][0]["mystic"] = run
                 db[chat_id][0]["markup"] = "tg"
             elif "vid_" in queued:
-                mystic = await app.send_message(original_chat_id, _["call_7"])
+                mystic = await Outbound.send(
+                    REPLY, original_chat_id, app.send_message, original_chat_id, _["call_7"]
+                )
                 try:
                     file_path, direct = await YouTube.download(
                         videoid,
                         mystic,
                         videoid=True,
                         video=True if str(streamtype) == "video" else False,
+                        chat_id=chat_id,
                     )
                 except:
                     return await mystic.edit_text(
                         _["call_6"], disable_web_page_preview=True
                     )
-                if video:
-                    stream = MediaStream(
-                        file_path,
-                        audio_parameters=AudioQuality.HIGH,
-                        video_parameters=VideoQuality.SD_480p,
-                    )
-                else:
-                    stream = MediaStream(
-                        file_path,
-                        audio_parameters=AudioQuality.HIGH,
-                        video_flags=MediaStream.Flags.IGNORE
-                    )
+                stream = await self._build_stream(chat_id, file_path, video)
                 try:
                     await client.play(chat_id, stream)
                 except:
-                    return await app.send_message(
+                    return await Outbound.send(
+                        REPLY,
+                        original_chat_id,
+                        app.send_message,
                         original_chat_id,
                         text=_["call_6"],
                     )
                 img = await get_thumb(videoid)
                 button = stream_markup(_, chat_id)
                 await mystic.delete()
-                run = await app.send_photo(
+                run = await Outbound.send(
+                    PLAYBACK,
+                    original_chat_id,
+                    app.send_photo,
                     chat_id=original_chat_id,
                     photo=img,
                     caption=_["stream_1"].format(
@@ -477,24 +695,22 @@ class Call(PyTgCalls):
                 db[chat_id][0]["mystic"] = run
                 db[chat_id][0]["markup"] = "stream"
             elif "index_" in queued:
-                stream = (
-                    MediaStream(
-                        videoid,
-                        audio_parameters=AudioQuality.HIGH,
-                        video_parameters=VideoQuality.SD_480p,
-                    )
-                    if str(streamtype) == "video"
-                    else MediaStream(videoid, audio_parameters=AudioQuality.HIGH, video_flags=MediaStream.Flags.IGNORE)
-                )
+                stream = await self._build_stream(chat_id, videoid, video)
                 try:
                     await client.play(chat_id, stream)
                 except:
-                    return await app.send_message(
+                    return await Outbound.send(
+                        REPLY,
+                        original_chat_id,
+                        app.send_message,
                         original_chat_id,
                         text=_["call_6"],
                     )
                 button = stream_markup(_, chat_id)
-                run = await app.send_photo(
+                run = await Outbound.send(
+                    PLAYBACK,
+                    original_chat_id,
+                    app.send_photo,
                     chat_id=original_chat_id,
                     photo=config.STREAM_IMG_URL,
                     caption=_["stream_2"].format(user),
@@ -503,28 +719,26 @@ class Call(PyTgCalls):
                 db[chat_id][0]["mystic"] = run
                 db[chat_id][0]["markup"] = "tg"
             else:
-                if video:
-                    stream = MediaStream(
-                        queued,
-                        audio_parameters=AudioQuality.HIGH,
-                        video_parameters=VideoQuality.SD_480p,
-                    )
-                else:
-                    stream = MediaStream(
-                        queued,
-                        audio_parameters=AudioQuality.HIGH,
-                        video_flags=MediaStream.Flags.IGNORE
-                    )
+                source, follow = Telegram.source(queued)
+                stream = await self._build_stream(chat_id, source, video, follow)
                 try:
                     await client.play(chat_id, stream)
                 except:
-                    return await app.send_message(
+                    return await Outbound.send(
+                        REPLY,
+                        original_chat_id,
+                        app.send_message,
                         original_chat_id,
                         text=_["call_6"],
                     )
+                if follow:
+                    self._follow(chat_id, queued)
                 if videoid == "telegram":
                     button = stream_markup(_, chat_id)
-                    run = await app.send_photo(
+                    run = await Outbound.send(
+                        PLAYBACK,
+                        original_chat_id,
+                        app.send_photo,
                         chat_id=original_chat_id,
                         photo=config.TELEGRAM_AUDIO_URL
                         if str(streamtype) == "audio"
@@ -538,7 +752,10 @@ class Call(PyTgCalls):
                     db[chat_id][0]["markup"] = "tg"
                 elif videoid == "soundcloud":
                     button = stream_markup(_, chat_id)
-                    run = await app.send_photo(
+                    run = await Outbound.send(
+                        PLAYBACK,
+                        original_chat_id,
+                        app.send_photo,
                         chat_id=original_chat_id,
                         photo=config.SOUNCLOUD_IMG_URL,
                         caption=_["stream_1"].format(
@@ -551,7 +768,10 @@ class Call(PyTgCalls):
                 else:
                     img = await get_thumb(videoid)
                     button = stream_markup(_, chat_id)
-                    run = await app.send_photo(
+                    run = await Outbound.send(
+                        PLAYBACK,
+                        original_chat_id,
+                        app.send_photo,
                         chat_id=original_chat_id,
                         photo=img,
                         caption=_["stream_1"].format(
@@ -0,0 +1,119 @@
+import asyncio
+from urllib.parse import urlsplit
+
+import aiohttp
+
+import config
+
+from ..logging import LOGGER
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def _parse_timeouts(raw: str) -> dict:
+    timeouts = {}
+    for item in raw.split(","):
+        if "=" not in item:
+            continue
+        host, value = item.split("=", 1)
+        try:
+            timeouts[host.strip().lower()] = float(value)
+        except ValueError:
+            continue
+    return timeouts
+
+
+class HttpClient:
+    """
+    The process-wide aiohttp session.
+
+    Every outbound HTTP call (platform scrapers, Spotify, thumbnails, carbon,
+    pastes) shares one pooled connector with a DNS cache, so keep-alive
+    connections are reused instead of handshaking per request.
+    """
+
+    def __init__(self):
+        self._session = None
+        self.host_timeouts = _parse_timeouts(config.HTTP_HOST_TIMEOUTS)
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=config.HTTP_POOL_LIMIT,
+                    limit_per_host=config.HTTP_POOL_PER_HOST,
+                    ttl_dns_cache=config.HTTP_DNS_TTL,
+                ),
+                timeout=aiohttp.ClientTimeout(
+                    total=config.HTTP_TIMEOUT, connect=config.HTTP_CONNECT_TIMEOUT
+                ),
+            )
+        return self._session
+
+    async def start(self):
+        return self.session
+
+    async def close(self):
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def timeout(self, url: str, total: float = None) -> aiohttp.ClientTimeout:
+        host = (urlsplit(url).hostname or "").lower()
+        return aiohttp.ClientTimeout(
+            total=total or self.host_timeouts.get(host, config.HTTP_TIMEOUT),
+            connect=config.HTTP_CONNECT_TIMEOUT,
+        )
+
+    async def fetch(
+        self,
+        method: str,
+        url: str,
+        read: str = "text",
+        retries: int = None,
+        timeout: float = None,
+        **kwargs,
+    ):
+        """
+        Send a request and return ``(status, body)``.
+
+        ``read`` is "text", "json", "bytes", or a coroutine function that
+        consumes the response itself. Idempotent methods are retried with
+        backoff on connection errors and 429/5xx answers.
+        """
+        if retries is None:
+            retries = config.HTTP_RETRIES if method.upper() in ("GET", "HEAD") else 0
+        kwargs.setdefault("timeout", self.timeout(url, timeout))
+        attempt = 0
+        while True:
+            try:
+                async with self.session.request(method, url, **kwargs) as response:
+                    if response.status in RETRY_STATUSES and attempt < retries:
+                        delay = float(response.headers.get("Retry-After", 0) or 0)
+                        raise _Retry(delay)
+                    if callable(read):
+                        body = await read(response)
+                    elif read == "json":
+                        body = await response.json(content_type=None)
+                    elif read == "bytes":
+                        body = await response.read()
+                    else:
+                        body = await response.text()
+                    return response.status, body
+            except (_Retry, aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if attempt >= retries:
+                    raise
+                attempt += 1
+                delay = e.delay if isinstance(e, _Retry) and e.delay else 0.5 * 2**attempt
+                LOGGER(__name__).debug(f"Retrying {method} {url} in {delay:.1f}s: {e!r}")
+                await asyncio.sleep(min(delay, 10))
+
+
+class _Retry(Exception):
+    def __init__(self, delay: float):
+        super().__init__(delay)
+        self.delay = delay
+
+
+http = HttpClient()
@@ -0,0 +1,224 @@
+import functools
+import threading
+import time
+
+from pymongo import monitoring
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+REGISTRY = []
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=()) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    pairs.extend(f'{n}="{_escape(v)}"' for n, v in extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, doc: str, labels=()):
+        self.name = name
+        self.doc = doc
+        self.labelnames = tuple(labels)
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def header(self):
+        yield f"# HELP {self.name} {self.doc}"
+        yield f"# TYPE {self.name} {self.kind}"
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name, doc, labels=()):
+        super().__init__(name, doc, labels)
+        self._values = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        yield from self.header()
+        with self._lock:
+            values = list(self._values.items())
+        for key, value in values:
+            yield f"{self.name}{_labels(self.labelnames, key)} {value}"
+
+
+class Gauge(_Metric):
+    """
+    A gauge read from ``collect()`` at scrape time.
+
+    ``collect`` returns a number, or an iterable of ``(labels, value)`` pairs
+    where ``labels`` is a tuple matching ``labels``.
+    """
+
+    kind = "gauge"
+
+    def __init__(self, name, doc, labels=(), collect=None, kind=None):
+        super().__init__(name, doc, labels)
+        self.collect = collect
+        if kind:
+            self.kind = kind
+
+    def render(self):
+        yield from self.header()
+        value = self.collect()
+        if isinstance(value, (int, float)):
+            yield f"{self.name} {value}"
+            return
+        for key, val in value:
+            yield f"{self.name}{_labels(self.labelnames, key)} {val}"
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, doc, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, doc, labels)
+        self.buckets = tuple(buckets)
+        self._values = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0, 0.0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+            state[1] += 1
+            state[2] += value
+
+    def time(self, **labels):
+        return _Timer(self, labels)
+
+    def render(self):
+        yield from self.header()
+        with self._lock:
+            values = [(k, (list(v[0]), v[1], v[2])) for k, v in self._values.items()]
+        for key, (counts, total, summed) in values:
+            for bound, count in zip(self.buckets, counts):
+                le = _labels(self.labelnames, key, (("le", bound),))
+                yield f"{self.name}_bucket{le} {count}"
+            inf = _labels(self.labelnames, key, (("le", "+Inf"),))
+            yield f"{self.name}_bucket{inf} {total}"
+            yield f"{self.name}_count{_labels(self.labelnames, key)} {total}"
+            yield f"{self.name}_sum{_labels(self.labelnames, key)} {summed}"
+
+
+class _Timer:
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.started, **self.labels)
+        return False
+
+
+def render() -> str:
+    lines = []
+    for metric in REGISTRY:
+        try:
+            lines.extend(metric.render())
+        except Exception:
+            continue
+    return "\n".join(lines) + "\n"
+
+
+STREAM_API_SECONDS = Histogram(
+    "anon_stream_api_seconds", "Latency of stream backend calls", ("backend", "op")
+)
+STREAM_API_ERRORS = Counter(
+    "anon_stream_api_errors_total", "Failed stream backend calls", ("backend", "op")
+)
+SEARCH_SECONDS = Histogram("anon_search_seconds", "Latency of track searches", ("backend",))
+THUMB_SECONDS = Histogram("anon_thumbnail_render_seconds", "Time to render a thumbnail")
+MONGO_SECONDS = Histogram(
+    "anon_mongo_op_seconds", "Latency of Mongo commands", ("collection", "command")
+)
+MONGO_ERRORS = Counter(
+    "anon_mongo_op_errors_total", "Failed Mongo commands", ("collection", "command")
+)
+
+
+def observed(backend: str, op: str = None, search: bool = False):
+    """Time an async platform call into the stream API metrics."""
+
+    def decorator(func):
+        name = op or func.__name__
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            except Exception:
+                STREAM_API_ERRORS.inc(backend=backend, op=name)
+                raise
+            finally:
+                elapsed = time.perf_counter() - started
+                STREAM_API_SECONDS.observe(elapsed, backend=backend, op=name)
+                if search:
+                    SEARCH_SECONDS.observe(elapsed, backend=backend)
+
+        return wrapper
+
+    return decorator
+
+
+class MongoListener(monitoring.CommandListener):
+    """Feeds per-collection command latency into ``MONGO_SECONDS``."""
+
+    def __init__(self):
+        self._started = {}
+        self._lock = threading.Lock()
+        self.last_ok = 0.0
+        self.last_error = 0.0
+
+    def started(self, event):
+        collection = event.command.get(event.command_name)
+        if not isinstance(collection, str):
+            collection = "-"
+        with self._lock:
+            self._started[(event.connection_id, event.request_id)] = collection
+
+    def _pop(self, event) -> str:
+        with self._lock:
+            return self._started.pop((event.connection_id, event.request_id), "-")
+
+    def succeeded(self, event):
+        collection = self._pop(event)
+        MONGO_SECONDS.observe(
+            event.duration_micros / 1e6, collection=collection, command=event.command_name
+        )
+        self.last_ok = time.monotonic()
+
+    def failed(self, event):
+        collection = self._pop(event)
+        MONGO_SECONDS.observe(
+            event.duration_micros / 1e6, collection=collection, command=event.command_name
+        )
+        MONGO_ERRORS.inc(collection=collection, command=event.command_name)
+        self.last_error = time.monotonic()
+
+
+MONGO_LISTENER = MongoListener()
@@ -3,10 +3,11 @@ from motor.motor_asyncio import AsyncIOMotorClient
 from config import MONGO_DB_URI
 
 from ..logging import LOGGER
+from .metrics import MONGO_LISTENER
 
 LOGGER(__name__).info("📜 Connecting to your Mongo Database...")
 try:
-    _mongo_async_ = AsyncIOMotorClient(MONGO_DB_URI)
+    _mongo_async_ = AsyncIOMotorClient(MONGO_DB_URI, event_listeners=[MONGO_LISTENER])
     mongodb = _mongo_async_.Anon
     LOGGER(__name__).info("🗃️ Connected to your Mongo Database.")
 except:
@@ -1,9 +1,11 @@
 import re
 from typing import Union
 
-import aiohttp
-from bs4 import BeautifulSoup
-from youtubesearchpython.__future__ import VideosSearch
+from AnonMusic.core.http import http
+from AnonMusic.core.metrics import observed
+from AnonMusic.utils.database import get_yt_match
+from AnonMusic.utils.matching import youtube_match
+from AnonMusic.utils.metatags import meta_reader
 
 
 class AppleAPI:
@@ -17,55 +19,38 @@ class AppleAPI:
         else:
             return False
 
+    @observed("apple", search=True)
     async def track(self, url, playid: Union[bool, str] = None):
         if playid:
             url = self.base + url
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status != 200:
-                    return False
-                html = await response.text()
-        soup = BeautifulSoup(html, "html.parser")
-        search = None
-        for tag in soup.find_all("meta"):
-            if tag.get("property", None) == "og:title":
-                search = tag.get("content", None)
+        key = f"apple:{url}"
+        track_details = await get_yt_match(key)
+        if track_details:
+            return track_details, track_details["vidid"]
+        status, meta = await http.fetch(
+            "GET", url, read=meta_reader(["og:title"], enough=["og:title"])
+        )
+        if status != 200:
+            return False
+        search = meta.get("og:title", [None])[-1]
         if search is None:
             return False
-        results = VideosSearch(search, limit=1)
-        for result in (await results.next())["result"]:
-            title = result["title"]
-            ytlink = result["link"]
-            vidid = result["id"]
-            duration_min = result["duration"]
-            thumbnail = result["thumbnails"][0]["url"].split("?")[0]
-        track_details = {
-            "title": title,
-            "link": ytlink,
-            "vidid": vidid,
-            "duration_min": duration_min,
-            "thumb": thumbnail,
-        }
-        return track_details, vidid
+        track_details = await youtube_match(search, key, lookup=False)
+        return track_details, track_details["vidid"]
 
+    @observed("apple")
     async def playlist(self, url, playid: Union[bool, str] = None):
         if playid:
             url = self.base + url
         playlist_id = url.split("playlist/")[1]
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status != 200:
-                    return False
-                html = await response.text()
-        soup = BeautifulSoup(html, "html.parser")
-        applelinks = soup.find_all("meta", attrs={"property": "music:song"})
+        status, meta = await http.fetch("GET", url, read=meta_reader(["music:song"]))
+        if status != 200:
+            return False
         results = []
-        for item in applelinks:
+        for item in meta.get("music:song", []):
             try:
-                xx = (((item["content"]).split("album/")[1]).split("/")[0]).replace(
-                    "-", " "
-                )
+                xx = ((item.split("album/")[1]).split("/")[0]).replace("-", " ")
             except:
-                xx = ((item["content"]).split("album/")[1]).split("/")[0]
+                continue
             results.append(xx)
         return results, playlist_id
@@ -1,9 +1,11 @@
 import re
 from typing import Union
 
-import aiohttp
-from bs4 import BeautifulSoup
-from youtubesearchpython.__future__ import VideosSearch
+from AnonMusic.core.http import http
+from AnonMusic.core.metrics import observed
+from AnonMusic.utils.database import get_yt_match
+from AnonMusic.utils.matching import youtube_match
+from AnonMusic.utils.metatags import meta_reader
 
 
 class RessoAPI:
@@ -17,38 +19,23 @@ class RessoAPI:
         else:
             return False
 
+    @observed("resso", search=True)
     async def track(self, url, playid: Union[bool, str] = None):
         if playid:
             url = self.base + url
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status != 200:
-                    return False
-                html = await response.text()
-        soup = BeautifulSoup(html, "html.parser")
-        for tag in soup.find_all("meta"):
-            if tag.get("property", None) == "og:title":
-                title = tag.get("content", None)
-            if tag.get("property", None) == "og:description":
-                des = tag.get("content", None)
-                try:
-                    des = des.split("·")[0]
-                except:
-                    pass
-        if des == "":
+        key = f"resso:{url.split('?')[0]}"
+        track_details = await get_yt_match(key)
+        if track_details:
+            return track_details, track_details["vidid"]
+        properties = ["og:title", "og:description"]
+        status, meta = await http.fetch(
+            "GET", url, read=meta_reader(properties, enough=properties)
+        )
+        if status != 200:
+            return False
+        title = meta.get("og:title", [None])[-1]
+        des = meta.get("og:description", [""])[-1].split("·")[0]
+        if des == "" or not title:
             return
-        results = VideosSearch(title, limit=1)
-        for result in (await results.next())["result"]:
-            title = result["title"]
-            ytlink = result["link"]
-            vidid = result["id"]
-            duration_min = result["duration"]
-            thumbnail = result["thumbnails"][0]["url"].split("?")[0]
-        track_details = {
-            "title": title,
-            "link": ytlink,
-            "vidid": vidid,
-            "duration_min": duration_min,
-            "thumb": thumbnail,
-        }
-        return track_details, vidid
+        track_details = await youtube_match(title, key, lookup=False)
+        return track_details, track_details["vidid"]
@@ -1,8 +1,9 @@
 from os import path
 
-from yt_dlp import YoutubeDL
-
+from AnonMusic.core.metrics import observed
+from AnonMusic.utils.extractor import Extractor
 from AnonMusic.utils.formatters import seconds_to_min
+from AnonMusic.utils.mediastore import Store
 
 
 class SoundAPI:
@@ -21,13 +22,23 @@ class SoundAPI:
         else:
             return False
 
+    @observed("soundcloud")
     async def download(self, url):
-        d = YoutubeDL(self.opts)
         try:
-            info = d.extract_info(url)
+            info = await Extractor.info(url, self.opts)
+            key = f"sc:{info['id']}"
+            xyz = await Store.get(key)
+            if not xyz:
+                target = path.join("downloads", f"{info['id']}.{info['ext']}")
+                info = await Extractor.download(url, self.opts, key)
+                xyz = await Store.put(
+                    key,
+                    info.get("filepath") or target,
+                    codec=info.get("acodec"),
+                    duration=info.get("duration"),
+                )
         except:
             return False
-        xyz = path.join("downloads", f"{info['id']}.{info['ext']}")
         duration_min = seconds_to_min(info["duration"])
         track_details = {
             "title": info["title"],
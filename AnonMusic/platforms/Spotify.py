@@ -1,10 +1,30 @@
+import asyncio
 import re
+import time
 
-import spotipy
-from spotipy.oauth2 import SpotifyClientCredentials
-from youtubesearchpython.__future__ import VideosSearch
+import aiohttp
 
 import config
+from AnonMusic.core.http import http
+from AnonMusic.core.metrics import observed
+from AnonMusic.utils.database import get_yt_match
+from AnonMusic.utils.matching import youtube_match
+
+API_BASE = "https://api.spotify.com/v1"
+TOKEN_URL = "https://accounts.spotify.com/api/token"
+
+
+class SpotifyError(Exception):
+    pass
+
+
+def _describe(track) -> str:
+    info = track["name"]
+    for artist in track["artists"]:
+        fetched = f' {artist["name"]}'
+        if "Various Artists" not in fetched:
+            info += fetched
+    return info
 
 
 class SpotifyAPI:
@@ -12,15 +32,10 @@ class SpotifyAPI:
         self.regex = r"^(https:\/\/open.spotify.com\/)(.*)$"
         self.client_id = config.SPOTIFY_CLIENT_ID
         self.client_secret = config.SPOTIFY_CLIENT_SECRET
-        if config.SPOTIFY_CLIENT_ID and config.SPOTIFY_CLIENT_SECRET:
-            self.client_credentials_manager = SpotifyClientCredentials(
-                self.client_id, self.client_secret
-            )
-            self.spotify = spotipy.Spotify(
-                client_credentials_manager=self.client_credentials_manager
-            )
-        else:
-            self.spotify = None
+        self.spotify = bool(self.client_id and self.client_secret)
+        self._token = None
+        self._expires = 0.0
+        self._token_lock = None
 
     async def valid(self, link: str):
         if re.search(self.regex, link):
@@ -28,71 +43,119 @@ class SpotifyAPI:
         else:
             return False
 
+    def _id(self, link: str) -> str:
+        match = re.search(r"(?:track|playlist|album|artist)[/:]([A-Za-z0-9]+)", link)
+        return match.group(1) if match else link.split("?")[0]
+
+    async def _access_token(self, refresh: bool = False) -> str:
+        """Client-credentials token, renewed a minute before it expires."""
+        if self._token_lock is None:
+            self._token_lock = asyncio.Lock()
+        async with self._token_lock:
+            if not refresh and self._token and time.monotonic() < self._expires - 60:
+                return self._token
+            async with http.session.post(
+                TOKEN_URL,
+                data={"grant_type": "client_credentials"},
+                auth=aiohttp.BasicAuth(self.client_id, self.client_secret),
+            ) as response:
+                if response.status != 200:
+                    raise SpotifyError(f"Token request failed ({response.status})")
+                data = await response.json()
+            self._token = data["access_token"]
+            self._expires = time.monotonic() + int(data.get("expires_in", 3600))
+            return self._token
+
+    async def _get(self, path: str, **params) -> dict:
+        if not self.spotify:
+            raise SpotifyError("Spotify credentials are not configured")
+        refreshed = False
+        for _ in range(4):
+            token = await self._access_token()
+            async with http.session.get(
+                f"{API_BASE}{path}",
+                params=params,
+                timeout=http.timeout(API_BASE),
+                headers={"Authorization": f"Bearer {token}"},
+            ) as response:
+                if response.status == 200:
+                    return await response.json()
+                if response.status == 401 and not refreshed:
+                    refreshed = True
+                    await self._access_token(refresh=True)
+                    continue
+                if response.status == 429:
+                    await asyncio.sleep(int(response.headers.get("Retry-After", 1)))
+                    continue
+                raise SpotifyError(f"GET {path} failed ({response.status})")
+        raise SpotifyError(f"GET {path} kept being rate limited")
+
+    async def _pages(self, path: str, first: dict, page_size: int, limit: int = None, **params):
+        """
+        Yield track names from ``first`` and then from every later page.
+
+        Later pages are requested concurrently but yielded in order, so the
+        caller can start queueing while the rest is still in flight.
+        """
+        total = first.get("total") or 0
+        if limit:
+            total = min(total, limit)
+        offsets = range(page_size, total, page_size)
+        semaphore = asyncio.Semaphore(config.SPOTIFY_PAGE_CONCURRENCY)
+
+        async def fetch(offset):
+            async with semaphore:
+                return await self._get(path, offset=offset, limit=page_size, **params)
+
+        tasks = [asyncio.create_task(fetch(offset)) for offset in offsets]
+        count = 0
+        try:
+            for page in [first, *tasks]:
+                if not isinstance(page, dict):
+                    page = await page
+                for item in page.get("items") or []:
+                    track = item.get("track", item) if isinstance(item, dict) else None
+                    if not track or not track.get("name"):
+                        continue
+                    yield _describe(track)
+                    count += 1
+                    if limit and count >= limit:
+                        return
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    @observed("spotify", search=True)
     async def track(self, link: str):
-        track = self.spotify.track(link)
-        info = track["name"]
-        for artist in track["artists"]:
-            fetched = f' {artist["name"]}'
-            if "Various Artists" not in fetched:
-                info += fetched
-        results = VideosSearch(info, limit=1)
-        for result in (await results.next())["result"]:
-            ytlink = result["link"]
-            title = result["title"]
-            vidid = result["id"]
-            duration_min = result["duration"]
-            thumbnail = result["thumbnails"][0]["url"].split("?")[0]
-        track_details = {
-            "title": title,
-            "link": ytlink,
-            "vidid": vidid,
-            "duration_min": duration_min,
-            "thumb": thumbnail,
-        }
-        return track_details, vidid
-
-    async def playlist(self, url):
-        playlist = self.spotify.playlist(url)
-        playlist_id = playlist["id"]
-        results = []
-        for item in playlist["tracks"]["items"]:
-            music_track = item["track"]
-            info = music_track["name"]
-            for artist in music_track["artists"]:
-                fetched = f' {artist["name"]}'
-                if "Various Artists" not in fetched:
-                    info += fetched
-            results.append(info)
+        track_id = self._id(link)
+        key = f"spotify:{track_id}"
+        track_details = await get_yt_match(key)
+        if not track_details:
+            track = await self._get(f"/tracks/{track_id}")
+            track_details = await youtube_match(_describe(track), key, lookup=False)
+        return track_details, track_details["vidid"]
+
+    @observed("spotify")
+    async def playlist(self, url, limit: int = None):
+        playlist_id = self._id(url)
+        path = f"/playlists/{playlist_id}/tracks"
+        fields = "items(track(name,artists(name))),total"
+        first = await self._get(path, limit=100, fields=fields)
+        results = self._pages(path, first, 100, limit or config.PLAYLIST_FETCH_LIMIT, fields=fields)
         return results, playlist_id
 
-    async def album(self, url):
-        album = self.spotify.album(url)
-        album_id = album["id"]
-        results = []
-        for item in album["tracks"]["items"]:
-            info = item["name"]
-            for artist in item["artists"]:
-                fetched = f' {artist["name"]}'
-                if "Various Artists" not in fetched:
-                    info += fetched
-            results.append(info)
-
-        return (
-            results,
-            album_id,
+    @observed("spotify")
+    async def album(self, url, limit: int = None):
+        album_id = self._id(url)
+        first = await self._get(f"/albums/{album_id}/tracks", limit=50)
+        results = self._pages(
+            f"/albums/{album_id}/tracks", first, 50, limit or config.PLAYLIST_FETCH_LIMIT
         )
+        return results, album_id
 
+    @observed("spotify")
     async def artist(self, url):
-        artistinfo = self.spotify.artist(url)
-        artist_id = artistinfo["id"]
-        results = []
-        artisttoptracks = self.spotify.artist_top_tracks(url)
-        for item in artisttoptracks["tracks"]:
-            info = item["name"]
-            for artist in item["artists"]:
-                fetched = f' {artist["name"]}'
-                if "Various Artists" not in fetched:
-                    info += fetched
-            results.append(info)
-
+        artist_id = self._id(url)
+        toptracks = await self._get(f"/artists/{artist_id}/top-tracks", market="US")
+        results = [_describe(item) for item in toptracks["tracks"]]
         return results, artist_id
@@ -7,18 +7,118 @@ from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup, Voice
 
 import config
 from AnonMusic import app
+from AnonMusic.core.metrics import observed
+from AnonMusic.logging import LOGGER
 from AnonMusic.utils.formatters import (
-    check_duration,
     convert_bytes,
     get_readable_time,
     seconds_to_min,
 )
+from AnonMusic.utils.mediastore import Store
+from AnonMusic.utils.outbound import COSMETIC, REPLY, Outbound
+from AnonMusic.utils.probe import Probe
+
+
+CHUNK_SIZE = 1024 * 1024  # pyrogram's stream_media offsets count 1 MiB chunks
+
+
+def _replied_media(message):
+    reply = message.reply_to_message
+    return reply.audio or reply.voice or reply.video or reply.document
 
 
 class TeleAPI:
     def __init__(self):
         self.chars_limit = 4096
         self.sleep = 5
+        self.downloads = {}
+
+    async def _fetch(self, message, fname, total, listeners):
+        """
+        Stream ``message``'s media into ``fname.part`` and rename it on completion.
+
+        A failed attempt keeps the whole chunks already written and the next
+        attempt resumes from there, so only the broken tail is fetched again.
+        """
+        part = f"{fname}.part"
+        done = 0
+        for attempt in range(config.TG_DOWNLOAD_RETRIES + 1):
+            offset = os.path.getsize(part) // CHUNK_SIZE if os.path.exists(part) else 0
+            done = offset * CHUNK_SIZE
+            try:
+                with open(part, "ab") as f:
+                    f.truncate(done)
+                    async for chunk in app.stream_media(message, offset=offset):
+                        f.write(chunk)
+                        done += len(chunk)
+                        for progress in list(listeners):
+                            await progress(done, total)
+                break
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if attempt >= config.TG_DOWNLOAD_RETRIES:
+                    raise
+                LOGGER(__name__).warning(
+                    f"Download of {fname} failed at {convert_bytes(done)}, resuming: {e}"
+                )
+                await asyncio.sleep(min(2**attempt, 10))
+        if total and done != total:
+            raise IOError(f"Incomplete download of {fname}: {done}/{total} bytes")
+        os.replace(part, fname)
+        return fname
+
+    async def _shared_download(self, message, fname, total, progress):
+        """
+        Download ``fname`` once however many chats ask for it together.
+
+        Every waiter gets progress updates; the transfer is only cancelled
+        once the last waiter cancels.
+        """
+        job = self.downloads.get(fname)
+        if job is None:
+            listeners = []
+            task = asyncio.create_task(self._fetch(message, fname, total, listeners))
+            job = self.downloads[fname] = (task, listeners)
+            task.add_done_callback(
+                lambda _: self.downloads.get(fname) is job and self.downloads.pop(fname)
+            )
+        task, listeners = job
+        listeners.append(progress)
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            listeners.remove(progress)
+            if not listeners:
+                task.cancel()
+            raise
+        finally:
+            if progress in listeners:
+                listeners.remove(progress)
+
+    def downloading(self, fname) -> bool:
+        return fname in self.downloads
+
+    async def wait(self, fname):
+        """Wait for an in-flight download of ``fname`` to finish."""
+        job = self.downloads.get(fname)
+        if job:
+            await asyncio.shield(job[0])
+
+    def source(self, path):
+        """
+        Where ffmpeg should read ``path`` from, and the input flags it needs.
+
+        While ``path`` is still downloading its ``.part`` file is read with
+        ``-follow``, so ffmpeg waits for new data at the end of the file
+        instead of stopping there; the call moves to the finished file once
+        the download completes.
+        """
+        part = f"{path}.part"
+        if isinstance(path, str) and not os.path.exists(path) and os.path.exists(part):
+            idle = int(config.TG_PROGRESSIVE_IDLE * 1000000)
+            return part, f"-follow 1 -rw_timeout {idle}"
+        return path, None
 
     async def send_split_text(self, message, string):
         n = self.chars_limit
@@ -53,13 +153,13 @@ class TeleAPI:
         try:
             dur = seconds_to_min(filex.duration)
         except:
-            try:
-                dur = await asyncio.get_event_loop().run_in_executor(
-                    None, check_duration, file_path
-                )
-                dur = seconds_to_min(dur)
-            except:
+            # A partial file has no reliable duration yet.
+            if self.downloading(file_path):
                 return "Unknown"
+            dur = await Probe.duration(file_path)
+            if dur is None:
+                return "Unknown"
+            dur = seconds_to_min(int(dur))
         return dur
 
     async def get_filepath(
@@ -80,7 +180,6 @@ class TeleAPI:
                 )
             except:
                 file_name = audio.file_unique_id + "." + "ogg"
-            file_name = os.path.join(os.path.realpath("downloads"), file_name)
         if video:
             try:
                 file_name = (
@@ -88,19 +187,32 @@ class TeleAPI:
                 )
             except:
                 file_name = video.file_unique_id + "." + "mp4"
-            file_name = os.path.join(os.path.realpath("downloads"), file_name)
-        return file_name
+        key = f"tg:{(audio or video).file_unique_id}"
+        return await Store.get(key) or Store.path_for(key, file_name.split(".")[-1])
+
+    @observed("telegram")
+    async def download(self, _, message, mystic, fname, progressive=False):
+        """
+        Download the replied media to ``fname``.
 
-    async def download(self, _, message, mystic, fname):
+        With ``progressive`` this returns as soon as TG_PROGRESSIVE_BUFFER bytes
+        are on disk; the rest keeps streaming in, with the same progress
+        messages, while ``source`` lets playback read the partial file.
+        """
         lower = [0, 8, 17, 38, 64, 77, 96]
         higher = [5, 10, 20, 40, 66, 80, 99]
         checker = [5, 10, 20, 40, 66, 80, 99]
         speed_counter = {}
-        if os.path.exists(fname):
+        buffered = asyncio.Event()
+        media = _replied_media(message)
+        key = f"tg:{media.file_unique_id}"
+        if await Store.get(key):
             return True
 
         async def down_load():
             async def progress(current, total):
+                if current >= config.TG_PROGRESSIVE_BUFFER:
+                    buffered.set()
                 if current == total:
                     return
                 current_time = time.time()
@@ -133,44 +245,63 @@ class TeleAPI:
                     check = int(checker[counter])
                     if low < percentage <= high:
                         if high == check:
-                            try:
-                                await mystic.edit_text(
-                                    text=_["tg_1"].format(
-                                        app.mention,
-                                        total_size,
-                                        completed_size,
-                                        percentage[:5],
-                                        speed,
-                                        eta,
-                                    ),
-                                    reply_markup=upl,
-                                )
-                                checker[counter] = 100
-                            except:
-                                pass
+                            Outbound.post(
+                                COSMETIC,
+                                mystic.chat.id,
+                                mystic.edit_text,
+                                text=_["tg_1"].format(
+                                    app.mention,
+                                    total_size,
+                                    completed_size,
+                                    percentage,
+                                    speed,
+                                    eta,
+                                ),
+                                reply_markup=upl,
+                                key=("edit", mystic.chat.id, mystic.id),
+                            )
+                            checker[counter] = 100
 
             speed_counter[message.id] = time.time()
             try:
-                await app.download_media(
+                await self._shared_download(
                     message.reply_to_message,
-                    file_name=fname,
-                    progress=progress,
+                    fname,
+                    getattr(media, "file_size", 0),
+                    progress,
                 )
+                if not await Store.get(key):
+                    await Store.put(key, fname, duration=getattr(media, "duration", None))
+                if buffered.is_set() and progressive:
+                    return Outbound.post(COSMETIC, mystic.chat.id, mystic.delete)
                 try:
                     elapsed = get_readable_time(
                         int(int(time.time()) - int(speed_counter[message.id]))
                     )
                 except:
                     elapsed = "0 sᴇᴄᴏɴᴅs"
-                await mystic.edit_text(_["tg_2"].format(elapsed))
+                await Outbound.send(
+                    REPLY,
+                    mystic.chat.id,
+                    mystic.edit_text,
+                    _["tg_2"].format(elapsed),
+                    key=("edit", mystic.chat.id, mystic.id),
+                )
             except:
                 await mystic.edit_text(_["tg_3"])
 
         task = asyncio.create_task(down_load())
         config.lyrical[mystic.id] = task
+        if progressive:
+            ready = asyncio.create_task(buffered.wait())
+            await asyncio.wait({task, ready}, return_when=asyncio.FIRST_COMPLETED)
+            ready.cancel()
+            if not task.done():
+                task.add_done_callback(lambda _: config.lyrical.pop(mystic.id, None))
+                return True
         await task
         verify = config.lyrical.get(mystic.id)
         if not verify:
             return False
         config.lyrical.pop(mystic.id)
-        return True
+        return os.path.exists(fname)
@@ -1,4 +1,4 @@
-import asyncio, httpx, yt_dlp, os
+import asyncio, httpx, os
 import glob, re, random, json, requests
 
 from typing import Union
@@ -9,8 +9,16 @@ from pyrogram.enums import MessageEntityType
 from concurrent.futures import ThreadPoolExecutor
 from youtubesearchpython.__future__ import VideosSearch, CustomSearch
 
+import config
+from AnonMusic.core.metrics import observed
+from AnonMusic.utils.cache import TTLCache
 from AnonMusic.utils.database import is_on_off
+from AnonMusic.utils.extractor import Extractor
 from AnonMusic.utils.formatters import time_to_seconds
+from AnonMusic.utils.mediastore import Store
+from AnonMusic.utils.matching import normalize_query, youtube_match
+from AnonMusic.utils.tracing import traced
+from AnonMusic.utils.transcode import LIVE, USER, Jobs
 
 def cookie_txt_file():
     try:
@@ -70,6 +78,15 @@ async def get_stream_url(query, video=False):
     return ""
 
 
+VIDEO_ID = re.compile(r"(?:[?&]v=|youtu\.be/|/shorts/|/live/|/embed/)([\w-]{11})")
+
+
+def video_id(link: str):
+    """The video id in a YouTube URL, or None if it has none."""
+    match = VIDEO_ID.search(link or "")
+    return match.group(1) if match else None
+
+
 class YouTubeAPI:
     def __init__(self):
         self.base = "https://www.youtube.com/watch?v="
@@ -77,6 +94,34 @@ class YouTubeAPI:
         self.status = "https://www.youtube.com/oembed?url="
         self.listbase = "https://youtube.com/playlist?list="
         self.reg = re.compile(r"\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])")
+        self.searches = TTLCache(config.SEARCH_CACHE_SIZE, config.SEARCH_CACHE_TTL)
+
+    async def search(self, query: str) -> list:
+        """Top 10 results for ``query``, shared by track() and every slider page."""
+        # Video ids and URLs are case-sensitive, so only free text is normalized.
+        vid = video_id(query)
+        if vid:
+            key = f"id:{vid}"
+        elif query.startswith(("http://", "https://")):
+            key = f"url:{query}"
+        else:
+            key = normalize_query(query)
+        results = self.searches.get(key)
+        if results is None:
+            found = (await VideosSearch(query, limit=10).next()).get("result") or []
+            results = [
+                {
+                    "title": result["title"],
+                    "duration": result["duration"],
+                    "id": result["id"],
+                    "link": result["link"],
+                    "thumb": result["thumbnails"][0]["url"].split("?")[0],
+                }
+                for result in found
+            ]
+            if results:
+                self.searches.set(key, results)
+        return results
 
     async def exists(self, link: str, videoid: Union[bool, str] = None):
         if videoid:
@@ -110,21 +155,25 @@ class YouTubeAPI:
             return None
         return text[offset : offset + length]
 
+    @observed("youtube", search=True)
     async def details(self, link: str, videoid: Union[bool, str] = None):
         if videoid:
             link = self.base + link
         if "&" in link:
             link = link.split("&")[0]
-        results = VideosSearch(link, limit=1)
-        for result in (await results.next())["result"]:
-            title = result["title"]
-            duration_min = result["duration"]
-            thumbnail = result["thumbnails"][0]["url"].split("?")[0]
-            vidid = result["id"]
-            if str(duration_min) == "None":
-                duration_sec = 0
-            else:
-                duration_sec = int(time_to_seconds(duration_min))
+        if re.search(self.regex, link):
+            # Direct links only go through the short-lived search cache, so
+            # live streams and edited videos are not served stale for a week.
+            result = (await self.search(link))[0]
+            title, duration_min, vidid = result["title"], result["duration"], result["id"]
+        else:
+            result = await youtube_match(link)
+            title, duration_min, vidid = result["title"], result["duration_min"], result["vidid"]
+        thumbnail = result["thumb"]
+        if str(duration_min) == "None":
+            duration_sec = 0
+        else:
+            duration_sec = int(time_to_seconds(duration_min))
         return title, duration_min, duration_sec, thumbnail, vidid
 
     async def title(self, link: str, videoid: Union[bool, str] = None):
@@ -157,15 +206,19 @@ class YouTubeAPI:
             thumbnail = result["thumbnails"][0]["url"].split("?")[0]
         return thumbnail
 
+    @observed("youtube")
     async def video(self, link: str, videoid: Union[bool, str] = None):
         if videoid:
             link = self.base + link
         if "&" in link:
             link = link.split("&")[0]
-            
-        return await get_stream_url(link, True)
+        stream_url = await get_stream_url(link, True)
+        if stream_url:
+            return 1, stream_url
+        return 0, "No stream url found"
         
 
+    @observed("youtube")
     async def playlist(self, link, limit, user_id, videoid: Union[bool, str] = None):
         if videoid:
             link = self.listbase + link
@@ -183,18 +236,19 @@ class YouTubeAPI:
             result = []
         return result
 
+    @traced("youtube_track")
+    @observed("youtube", search=True)
     async def track(self, link: str, videoid: Union[bool, str] = None):
         if videoid:
             link = self.base + link
         if "&" in link:
             link = link.split("&")[0]
-        results = VideosSearch(link, limit=1)
-        for result in (await results.next())["result"]:
-            title = result["title"]
-            duration_min = result["duration"]
-            vidid = result["id"]
-            yturl = result["link"]
-            thumbnail = result["thumbnails"][0]["url"].split("?")[0]
+        result = (await self.search(link))[0]
+        title = result["title"]
+        duration_min = result["duration"]
+        vidid = result["id"]
+        yturl = result["link"]
+        thumbnail = result["thumb"]
         track_details = {
             "title": title,
             "link": yturl,
@@ -210,36 +264,35 @@ class YouTubeAPI:
         if "&" in link:
             link = link.split("&")[0]
         ytdl_opts = {"quiet": True}
-        ydl = yt_dlp.YoutubeDL(ytdl_opts)
-        with ydl:
-            formats_available = []
-            r = ydl.extract_info(link, download=False)
-            for format in r["formats"]:
+        formats_available = []
+        r = await Extractor.info(link, ytdl_opts)
+        for format in r["formats"]:
+            try:
+                str(format["format"])
+            except:
+                continue
+            if not "dash" in str(format["format"]).lower():
                 try:
-                    str(format["format"])
+                    format["format"]
+                    format["filesize"]
+                    format["format_id"]
+                    format["ext"]
+                    format["format_note"]
                 except:
                     continue
-                if not "dash" in str(format["format"]).lower():
-                    try:
-                        format["format"]
-                        format["filesize"]
-                        format["format_id"]
-                        format["ext"]
-                        format["format_note"]
-                    except:
-                        continue
-                    formats_available.append(
-                        {
-                            "format": format["format"],
-                            "filesize": format["filesize"],
-                            "format_id": format["format_id"],
-                            "ext": format["ext"],
-                            "format_note": format["format_note"],
-                            "yturl": link,
-                        }
-                    )
+                formats_available.append(
+                    {
+                        "format": format["format"],
+                        "filesize": format["filesize"],
+                        "format_id": format["format_id"],
+                        "ext": format["ext"],
+                        "format_note": format["format_note"],
+                        "yturl": link,
+                    }
+                )
         return formats_available, link
 
+    @observed("youtube", search=True)
     async def slider(
         self,
         link: str,
@@ -250,14 +303,15 @@ class YouTubeAPI:
             link = self.base + link
         if "&" in link:
             link = link.split("&")[0]
-        a = VideosSearch(link, limit=10)
-        result = (await a.next()).get("result")
+        result = await self.search(link)
         title = result[query_type]["title"]
         duration_min = result[query_type]["duration"]
         vidid = result[query_type]["id"]
-        thumbnail = result[query_type]["thumbnails"][0]["url"].split("?")[0]
+        thumbnail = result[query_type]["thumb"]
         return title, duration_min, thumbnail, vidid
 
+    @traced("youtube_download")
+    @observed("youtube")
     async def download(
         self,
         link: str,
@@ -268,94 +322,92 @@ class YouTubeAPI:
         songvideo: Union[bool, str] = None,
         format_id: Union[bool, str] = None,
         title: Union[bool, str] = None,
+        chat_id: int = None,
     ) -> str:
         if videoid:
             link = self.base + link
-        loop = asyncio.get_running_loop()
+        common = {
+            "geo_bypass": True,
+            "nocheckcertificate": True,
+            "quiet": True,
+            "no_warnings": True,
+        }
 
-        def audio_dl():
-            ydl_optssx = {
-                "format": "bestaudio/best",
-                "outtmpl": "downloads/%(id)s.%(ext)s",
-                "geo_bypass": True,
-                "nocheckcertificate": True,
-                "quiet": True,
-                "no_warnings": True,
-            }
-            x = yt_dlp.YoutubeDL(ydl_optssx)
-            info = x.extract_info(link, False)
-            xyz = os.path.join("downloads", f"{info['id']}.{info['ext']}")
-            if os.path.exists(xyz):
-                return xyz
-            x.download([link])
-            return xyz
+        async def stored_dl(key, opts, fpath=None, priority=None, info=None):
+            stored = await Store.get(key)
+            if stored:
+                return stored
+            if priority is None:
+                info = await Extractor.download(link, opts, key, info=info)
+            else:
+                info = await Jobs.run(
+                    priority,
+                    key.rsplit(":", 1)[-1],
+                    lambda: Extractor.download(link, opts, key, info=info),
+                    chat_id=chat_id,
+                )
+            return await Store.put(
+                key,
+                fpath or info["filepath"],
+                codec=info.get("acodec") if key.endswith("audio") else info.get("vcodec"),
+                duration=info.get("duration"),
+            )
 
-        def video_dl():
-            ydl_optssx = {
-                "format": "(bestvideo[height<=?720][width<=?1280][ext=mp4])+(bestaudio[ext=m4a])",
-                "outtmpl": "downloads/%(id)s.%(ext)s",
-                "geo_bypass": True,
-                "nocheckcertificate": True,
-                "quiet": True,
-                "no_warnings": True,
-            }
-            x = yt_dlp.YoutubeDL(ydl_optssx)
-            info = x.extract_info(link, False)
-            xyz = os.path.join("downloads", f"{info['id']}.{info['ext']}")
-            if os.path.exists(xyz):
-                return xyz
-            x.download([link])
-            return xyz
+        async def source_id():
+            """The video id, extracting the page only when the link lacks one."""
+            vid = video_id(link)
+            if vid:
+                return vid, None
+            info = await Extractor.info(link, common)
+            return info["id"], info
 
-        def song_video_dl():
-            formats = f"{format_id}+140"
-            fpath = f"downloads/{title}"
-            ydl_optssx = {
-                "format": formats,
-                "outtmpl": fpath,
-                "geo_bypass": True,
-                "nocheckcertificate": True,
-                "quiet": True,
-                "no_warnings": True,
-                "prefer_ffmpeg": True,
-                "merge_output_format": "mp4",
-            }
-            x = yt_dlp.YoutubeDL(ydl_optssx)
-            x.download([link])
+        async def file_dl(video_format, variant, priority=None):
+            opts = dict(common, format=video_format, outtmpl="downloads/%(id)s.%(ext)s")
+            vid, info = await source_id()
+            return await stored_dl(f"yt:{vid}:{variant}", opts, priority=priority, info=info)
 
-        def song_audio_dl():
-            fpath = f"downloads/{title}.%(ext)s"
-            ydl_optssx = {
-                "format": format_id,
-                "outtmpl": fpath,
-                "geo_bypass": True,
-                "nocheckcertificate": True,
-                "quiet": True,
-                "no_warnings": True,
-                "prefer_ffmpeg": True,
-                "postprocessors": [
+        if songvideo:
+            fpath = f"downloads/{title}.mp4"
+            opts = dict(
+                common,
+                format=f"{format_id}+140",
+                outtmpl=f"downloads/{title}",
+                prefer_ffmpeg=True,
+                merge_output_format="mp4",
+            )
+            vid, info = await source_id()
+            return await stored_dl(f"yt:{vid}:{format_id}:video", opts, fpath, USER, info)
+        elif songaudio:
+            fpath = f"downloads/{title}.mp3"
+            opts = dict(
+                common,
+                format=format_id,
+                outtmpl=f"downloads/{title}.%(ext)s",
+                prefer_ffmpeg=True,
+                postprocessors=[
                     {
                         "key": "FFmpegExtractAudio",
                         "preferredcodec": "mp3",
                         "preferredquality": "192",
                     }
                 ],
-            }
-            x = yt_dlp.YoutubeDL(ydl_optssx)
-            x.download([link])
-
-        if songvideo:
-            await loop.run_in_executor(None, song_video_dl)
-            fpath = f"downloads/{title}.mp4"
-            return fpath
-        elif songaudio:
-            await loop.run_in_executor(None, song_audio_dl)
-            fpath = f"downloads/{title}.mp3"
-            return fpath
+            )
+            vid, info = await source_id()
+            return await stored_dl(f"yt:{vid}:{format_id}:audio", opts, fpath, USER, info)
         elif video:
             downloaded_file = await get_stream_url(link, True)
             direct = None
+            if not downloaded_file:
+                downloaded_file = await file_dl(
+                    "(bestvideo[height<=?720][width<=?1280][ext=mp4])+(bestaudio[ext=m4a])",
+                    "video",
+                    LIVE,
+                )
+                direct = True
         else:
             direct = None
             downloaded_file = await get_stream_url(link, False)
+            if not downloaded_file:
+                downloaded_file = await file_dl("bestaudio/best", "audio")
+                direct = True
         return downloaded_file, direct
@@ -320,7 +320,6 @@ async def del_back_playlist(client, CallbackQuery:CallbackQuery, _):
         if exis:
             db[chat_id][0]["dur"] = exis
             db[chat_id][0]["seconds"] = check[0]["old_second"]
-            db[chat_id][0]["speed_path"] = None
             db[chat_id][0]["speed"] = 1.0
         if "live_" in queued:
             n, link = await YouTube.video(videoid, True)
@@ -382,6 +381,7 @@ async def del_back_playlist(client, CallbackQuery:CallbackQuery, _):
                     mystic,
                     videoid=True,
                     video=status,
+                    chat_id=chat_id,
                 )
             except:
                 # 5 सेकंड बाद डिलीट करने के लिए, परमिशन हैंडलिंग के साथ:
@@ -56,9 +56,6 @@ async def seek_comm(cli, message: Message, _, chat_id):
         n, file_path = await YouTube.video(playing[0]["vidid"], True)
         if n == 0:
             return await message.reply_text(_["admin_22"])
-    check = (playing[0]).get("speed_path")
-    if check:
-        file_path = check
     if "index_" in file_path:
         file_path = playing[0]["vidid"]
     try:
@@ -68,6 +65,7 @@ async def seek_comm(cli, message: Message, _, chat_id):
             seconds_to_min(to_seek),
             duration,
             playing[0]["streamtype"],
+            playing[0].get("speed"),
         )
     except:
         return await mystic.edit_text(_["admin_26"], reply_markup=close_markup(_))
@@ -102,7 +102,6 @@ async def skip(cli, message: Message, _, chat_id):
     if exis:
         db[chat_id][0]["dur"] = exis
         db[chat_id][0]["seconds"] = check[0]["old_second"]
-        db[chat_id][0]["speed_path"] = None
         db[chat_id][0]["speed"] = 1.0
     if "live_" in queued:
         n, link = await YouTube.video(videoid, True)
@@ -138,6 +137,7 @@ async def skip(cli, message: Message, _, chat_id):
                 mystic,
                 videoid=True,
                 video=status,
+                chat_id=chat_id,
             )
         except:
             return await mystic.edit_text(_["call_6"])
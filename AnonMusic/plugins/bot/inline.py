@@ -6,6 +6,8 @@ from pyrogram.types import (
 from youtubesearchpython.__future__ import VideosSearch
 
 from AnonMusic import app
+from AnonMusic.misc import SUDOERS
+from AnonMusic.utils.admission import Admission
 from AnonMusic.utils.inlinequery import answer
 from config import BANNED_USERS
 
@@ -20,6 +22,14 @@ async def inline_query_handler(client, query):
         except:
             return
     else:
+        if query.from_user.id not in SUDOERS:
+            if Admission.check("inline", query.from_user.id):
+                try:
+                    return await client.answer_inline_query(
+                        query.id, results=[], cache_time=0
+                    )
+                except:
+                    return
         a = VideosSearch(text, limit=20)
         result = (await a.next()).get("result")
         for x in range(15):
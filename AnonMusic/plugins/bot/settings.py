@@ -9,18 +9,21 @@ from pyrogram.types import (
 )
 
 from AnonMusic import app
+from AnonMusic.core.call import Anony
 from AnonMusic.utils.database import (
     add_nonadmin_chat,
     get_authuser,
     get_authuser_names,
     get_playmode,
     get_playtype,
+    get_quality,
     get_upvote_count,
     is_nonadmin_chat,
     is_skipmode,
     remove_nonadmin_chat,
     set_playmode,
     set_playtype,
+    set_quality,
     set_upvotes,
     skip_off,
     skip_on,
@@ -30,6 +33,7 @@ from AnonMusic.utils.decorators.language import language, languageCB
 from AnonMusic.utils.inline.settings import (
     auth_users_markup,
     playmode_users_markup,
+    quality_markup,
     setting_markup,
     vote_mode_markup,
 )
@@ -140,7 +144,7 @@ async def settings_back_markup(client, CallbackQuery: CallbackQuery, _):
 ### Info/Answer Callback Queries Handles various informational callback queries (e.g., explaining settings).
 @app.on_callback_query(
     filters.regex(
-        pattern=r"^(SEARCHANSWER|PLAYMODEANSWER|PLAYTYPEANSWER|AUTHANSWER|ANSWERVOMODE|VOTEANSWER|PM|AU|VM)$"
+        pattern=r"^(SEARCHANSWER|PLAYMODEANSWER|PLAYTYPEANSWER|AUTHANSWER|ANSWERVOMODE|VOTEANSWER|QUALITYANSWER|PM|AU|VM|QM)$"
     )
     & ~BANNED_USERS
 )
@@ -164,6 +168,9 @@ async def without_Admin_rights(client, CallbackQuery: CallbackQuery, _):
     elif command == "VOTEANSWER":
         await safe_callback_answer(CallbackQuery, _["setting_8"], show_alert=True)
         return
+    elif command == "QUALITYANSWER":
+        await safe_callback_answer(CallbackQuery, _["setting_13"], show_alert=True)
+        return
     elif command == "ANSWERVOMODE":
         current_upvote_count = await get_upvote_count(chat_id)
         await safe_callback_answer(CallbackQuery, _["setting_9"].format(current_upvote_count), show_alert=True)
@@ -186,6 +193,9 @@ async def without_Admin_rights(client, CallbackQuery: CallbackQuery, _):
         skip_mode_enabled = await is_skipmode(chat_id)
         current_upvote_count = await get_upvote_count(chat_id)
         buttons = vote_mode_markup(_, current_upvote_count, skip_mode_enabled)
+    elif command == "QM":
+        await safe_callback_answer(CallbackQuery, _["set_cb_6"], show_alert=False)
+        buttons = quality_markup(_, await get_quality(chat_id))
 
     if buttons:
         await safe_edit_message_reply_markup(CallbackQuery, InlineKeyboardMarkup(buttons))
@@ -347,6 +357,19 @@ async def authusers_mar(client, CallbackQuery: CallbackQuery, _):
     
     await safe_edit_message_reply_markup(CallbackQuery, InlineKeyboardMarkup(buttons))
 
+### Stream Quality Handles the `QUALITY` callback to cap this chat's stream quality.
+@app.on_callback_query(filters.regex(pattern=r"^QUALITY (auto|medium|low)$") & ~BANNED_USERS)
+@ActualAdminCB
+async def quality_change(client, CallbackQuery: CallbackQuery, _):
+    chat_id = CallbackQuery.message.chat.id
+    mode = CallbackQuery.matches[0].group(1)
+    await safe_callback_answer(CallbackQuery, _["set_cb_3"], show_alert=False)
+    if mode != await get_quality(chat_id):
+        await set_quality(chat_id, mode)
+        await Anony.apply_chat_quality(chat_id)
+    buttons = quality_markup(_, mode)
+    await safe_edit_message_reply_markup(CallbackQuery, InlineKeyboardMarkup(buttons))
+
 ### Vote Mode ChangebHandles the `VOMODECHANGE` callback to toggle vote skip mode.
 @app.on_callback_query(filters.regex("VOMODECHANGE") & ~BANNED_USERS)
 @ActualAdminCB
@@ -16,6 +16,7 @@ from AnonMusic.utils.database import (
     get_served_users,
 )
 from AnonMusic.utils.formatters import alpha_to_int
+from AnonMusic.utils.outbound import BROADCAST, Outbound
 from config import adminlist
 
 class BroadcastStatus:
@@ -124,11 +125,18 @@ async def broadcast_command(client, message: Message):
     async def deliver(chat_id: Union[int, str]):
         try:
             if isinstance(content, str):
-                await app.send_message(chat_id, content)
+                await Outbound.send(BROADCAST, chat_id, app.send_message, chat_id, content)
             elif mode == "forward":
-                await app.forward_messages(chat_id, message.chat.id, [content.id])
+                await Outbound.send(
+                    BROADCAST,
+                    chat_id,
+                    app.forward_messages,
+                    chat_id,
+                    message.chat.id,
+                    [content.id],
+                )
             else:
-                await content.copy(chat_id)
+                await Outbound.send(BROADCAST, chat_id, content.copy, chat_id)
 
             broadcast_status.sent += 1
             if chat_id in target_users:
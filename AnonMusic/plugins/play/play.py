@@ -1,3 +1,4 @@
+import asyncio
 import random
 import string
 
@@ -82,7 +83,7 @@ async def play_commnd(
                 _["play_6"].format(config.DURATION_LIMIT_MIN, app.mention)
             )
         file_path = await Telegram.get_filepath(audio=audio_telegram)
-        if await Telegram.download(_, message, mystic, file_path):
+        if await Telegram.download(_, message, mystic, file_path, progressive=True):
             message_link = await Telegram.get_link(message)
             file_name = await Telegram.get_filename(audio_telegram, audio=True)
             dur = await Telegram.get_duration(audio_telegram, file_path)
@@ -110,7 +111,8 @@ async def play_commnd(
                 ex_type = type(e).__name__
                 err = e if ex_type == "AssistantErr" else _["general_2"].format(ex_type)
                 return await mystic.edit_text(err)
-            return await mystic.delete()
+            if not Telegram.downloading(file_path):
+                return await mystic.delete()
         return
     elif video_telegram:
         if message.reply_to_message.document:
@@ -127,7 +129,7 @@ async def play_commnd(
         if video_telegram.file_size > config.TG_VIDEO_FILESIZE_LIMIT:
             return await mystic.edit_text(_["play_8"])
         file_path = await Telegram.get_filepath(video=video_telegram)
-        if await Telegram.download(_, message, mystic, file_path):
+        if await Telegram.download(_, message, mystic, file_path, progressive=True):
             message_link = await Telegram.get_link(message)
             file_name = await Telegram.get_filename(video_telegram)
             dur = await Telegram.get_duration(video_telegram, file_path)
@@ -155,7 +157,8 @@ async def play_commnd(
                 ex_type = type(e).__name__
                 err = e if ex_type == "AssistantErr" else _["general_2"].format(ex_type)
                 return await mystic.edit_text(err)
-            return await mystic.delete()
+            if not Telegram.downloading(file_path):
+                return await mystic.delete()
         return
     elif url:
         if await YouTube.exists(url):
@@ -334,6 +337,11 @@ async def play_commnd(
         query = message.text.split(None, 1)[1]
         if "-v" in query:
             query = query.replace("-v", "")
+        queries = [x.strip() for x in query.splitlines() if x.strip()]
+        if len(queries) > 1:
+            return await batch_play(
+                _, message, mystic, chat_id, video, queries[: config.PLAYLIST_FETCH_LIMIT], fplay
+            )
         try:
             details, track_id = await YouTube.track(query)
         except:
@@ -443,6 +451,52 @@ async def play_commnd(
                 return await play_logs(message, streamtype=f"URL Searched Inline")
 
 
+async def batch_play(_, message, mystic, chat_id, video, queries, fplay):
+    """Resolve newline separated queries together and enqueue them in order."""
+    resolved = await asyncio.gather(
+        *[YouTube.track(query) for query in queries], return_exceptions=True
+    )
+    tracks = []
+    for item in resolved:
+        if isinstance(item, BaseException):
+            continue
+        details, track_id = item
+        if not details["duration_min"]:
+            continue
+        if time_to_seconds(details["duration_min"]) > config.DURATION_LIMIT:
+            continue
+        tracks.append(details)
+    if not tracks:
+        return await mystic.edit_text(_["play_3"])
+    try:
+        await stream(
+            _,
+            mystic,
+            message.from_user.id,
+            tracks,
+            chat_id,
+            message.from_user.first_name,
+            message.chat.id,
+            video=video,
+            streamtype="batch",
+            forceplay=fplay,
+        )
+    except Exception as e:
+        print(e)
+        ex_type = type(e).__name__
+        err = e if ex_type == "AssistantErr" else _["general_2"].format(ex_type)
+        try:
+            return await mystic.edit_text(err)
+        except MessageIdInvalid:
+            return
+    skipped = len(queries) - len(tracks)
+    if skipped:
+        await mystic.edit_text(_["play_24"].format(skipped))
+    else:
+        await mystic.delete()
+    return await play_logs(message, streamtype=f"Batch : {len(tracks)} tracks")
+
+
 @app.on_callback_query(filters.regex("MusicStream") & ~BANNED_USERS)
 @languageCB
 async def play_music(client, CallbackQuery, _):
@@ -0,0 +1,38 @@
+from pyrogram import filters
+from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup, Message
+
+from AnonMusic import app
+from AnonMusic.misc import SUDOERS
+from AnonMusic.utils.admission import Admission
+
+CLOSE_BUTTON = InlineKeyboardMarkup(
+    [[InlineKeyboardButton("ᴄʟᴏsᴇ", callback_data="close")]]
+)
+
+
+def _rows(rows):
+    if not rows:
+        return "• ɴᴏɴᴇ\n"
+    return "".join(
+        f"• <code>{key}</code> : {tokens:.1f}/{capacity:g}\n"
+        for key, tokens, capacity in rows
+    )
+
+
+@app.on_message(filters.command(["buckets", "admission"]) & SUDOERS)
+async def admission_state(_, message: Message):
+    state = Admission.snapshot()
+    tokens, capacity = state["global"]
+    users, chats = state["tracked"]
+    rejected = state["rejected"]
+    costs = ", ".join(f"{k}={v:g}" for k, v in state["costs"].items())
+    text = (
+        "<b>🚦 ᴀᴅᴍɪssɪᴏɴ ᴄᴏɴᴛʀᴏʟ :</b>\n\n"
+        f"🌐 ɢʟᴏʙᴀʟ : <code>{tokens:.1f}/{capacity:g}</code>\n"
+        f"✅ ᴀᴅᴍɪᴛᴛᴇᴅ : <code>{state['admitted']}</code>\n"
+        f"🚫 ʀᴇᴊᴇᴄᴛᴇᴅ : <code>user={rejected['user']} chat={rejected['chat']} global={rejected['global']}</code>\n"
+        f"💰 ᴄᴏsᴛs : <code>{costs}</code>\n\n"
+        f"<b>👤 ʙᴜsɪᴇsᴛ ᴜsᴇʀs ({users} ᴛʀᴀᴄᴋᴇᴅ) :</b>\n{_rows(state['users'])}\n"
+        f"<b>👥 ʙᴜsɪᴇsᴛ ᴄʜᴀᴛs ({chats} ᴛʀᴀᴄᴋᴇᴅ) :</b>\n{_rows(state['chats'])}"
+    )
+    await message.reply_text(text, reply_markup=CLOSE_BUTTON)
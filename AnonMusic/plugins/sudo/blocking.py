@@ -0,0 +1,37 @@
+from pyrogram import filters
+from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup, Message
+
+from AnonMusic import app
+from AnonMusic.misc import SUDOERS
+from AnonMusic.utils.watchdog import Watchdog
+
+CLOSE_BUTTON = InlineKeyboardMarkup(
+    [[InlineKeyboardButton("ᴄʟᴏsᴇ", callback_data="close")]]
+)
+
+
+@app.on_message(filters.command(["blocking", "watchdog"]) & SUDOERS)
+async def blocking_report(_, message: Message):
+    if len(message.command) > 1 and message.command[1].lower() == "reset":
+        Watchdog.reset()
+        return await message.reply_text("✅ ᴡᴀᴛᴄʜᴅᴏɢ ʀᴇᴘᴏʀᴛ ᴄʟᴇᴀʀᴇᴅ.")
+    if not Watchdog.threshold:
+        return await message.reply_text("⚠️ ᴡᴀᴛᴄʜᴅᴏɢ ɪs ᴅɪsᴀʙʟᴇᴅ (WATCHDOG_THRESHOLD=0).")
+    offenders = Watchdog.report()
+    text = (
+        f"<b>🐕 ʟᴏᴏᴘ ᴡᴀᴛᴄʜᴅᴏɢ (> {Watchdog.threshold:g}s) :</b>\n"
+        f"sᴛᴀʟʟs : <code>{Watchdog.stalls}</code>\n\n"
+    )
+    if not offenders:
+        text += "• ɴᴏ ʙʟᴏᴄᴋɪɴɢ ᴄᴀʟʟs ʀᴇᴄᴏʀᴅᴇᴅ."
+    for offender in offenders:
+        text += (
+            f"<b>{offender.where}</b>\n"
+            f"  ├ ɪɴ : <code>{offender.leaf}</code>\n"
+            f"  ├ sᴛᴀʟʟs : <code>{offender.stalls}</code>\n"
+            f"  └ ʙʟᴏᴄᴋᴇᴅ : <code>{offender.blocked:.2f}s</code> (ᴡᴏʀsᴛ <code>{offender.worst:.2f}s</code>)\n\n"
+        )
+    if len(message.command) > 1 and message.command[1].lower() == "stack" and offenders:
+        stack = "".join(offenders[0].stack).replace("<", "&lt;")
+        text += f"<pre>{stack[-1500:]}</pre>"
+    await message.reply_text(text[:4096], reply_markup=CLOSE_BUTTON)
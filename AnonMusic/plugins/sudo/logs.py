@@ -4,6 +4,7 @@ from pyrogram import filters
 from pyrogram.types import Message, InlineKeyboardButton, InlineKeyboardMarkup
 from pyrogram.errors import ChatAdminRequired
 from AnonMusic import app
+from AnonMusic.utils.outbound import LOGS, Outbound
 from config import LOGGER_ID
 
 
@@ -14,7 +15,10 @@ def get_time():
 
 async def send_message_with_button(chat_id, text, buttons=None):
     try:
-        msg = await app.send_message(
+        msg = await Outbound.send(
+            LOGS,
+            chat_id,
+            app.send_message,
             chat_id,
             text=text,
             reply_markup=InlineKeyboardMarkup(buttons) if buttons else None,
@@ -0,0 +1,39 @@
+from datetime import datetime
+
+from pyrogram import filters
+from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup, Message
+
+from AnonMusic import app
+from AnonMusic.misc import SUDOERS
+from AnonMusic.utils.tracing import Tracer
+
+CLOSE_BUTTON = InlineKeyboardMarkup(
+    [[InlineKeyboardButton("ᴄʟᴏsᴇ", callback_data="close")]]
+)
+
+
+@app.on_message(filters.command(["trace", "traces"]) & SUDOERS)
+async def slow_traces(_, message: Message):
+    limit = 5
+    if len(message.command) > 1 and message.command[1].isdigit():
+        limit = max(1, min(int(message.command[1]), Tracer.slow.maxlen))
+    traces = list(Tracer.slow)[-limit:][::-1]
+    text = (
+        f"<b>🐢 sʟᴏᴡ ᴘʟᴀʏs (> {Tracer.threshold:g}s) :</b>\n"
+        f"ᴛʀᴀᴄᴇᴅ : <code>{Tracer.total}</code> | sʟᴏᴡ ᴋᴇᴘᴛ : <code>{len(Tracer.slow)}</code>\n\n"
+    )
+    if not traces:
+        text += "• ɴᴏ sʟᴏᴡ ᴘʟᴀʏs ʀᴇᴄᴏʀᴅᴇᴅ."
+    for trace in traces:
+        when = datetime.fromtimestamp(trace.wall).strftime("%H:%M:%S")
+        query = (trace.query or "").replace("<", "&lt;")[:40]
+        text += (
+            f"<b>{when}</b> • <code>{trace.duration:.2f}s</code> • <code>{trace.chat_id}</code>"
+            + (f" • {trace.error}" if trace.error else "")
+            + f"\n<i>{query}</i>\n"
+        )
+        for stage, offset, elapsed, error in trace.spans:
+            text += f"  ├ <code>+{offset:.2f}s {stage} {elapsed:.2f}s</code>"
+            text += f" ⚠️ {error}\n" if error else "\n"
+        text += "\n"
+    await message.reply_text(text[:4096], reply_markup=CLOSE_BUTTON)
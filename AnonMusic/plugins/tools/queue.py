@@ -2,20 +2,19 @@ import asyncio
 import os
 
 from pyrogram import filters
-from pyrogram.errors import FloodWait
 from pyrogram.types import CallbackQuery, InputMediaPhoto, Message
 
 import config
 from AnonMusic import app
 from AnonMusic.misc import db
 from AnonMusic.utils import AnonyBin, get_channeplayCB, seconds_to_min
-from AnonMusic.utils.database import get_cmode, is_active_chat, is_music_playing
+from AnonMusic.utils.database import get_cmode, is_active_chat
 from AnonMusic.utils.decorators.language import language, languageCB
 from AnonMusic.utils.inline import queue_back_markup, queue_markup
+from AnonMusic.utils.load import Load
+from AnonMusic.utils.ticker import Ticker
 from config import BANNED_USERS
 
-basic = {}
-
 
 def get_image(videoid):
     if os.path.isfile(f"cache/{videoid}.png"):
@@ -96,35 +95,21 @@ async def get_queue(client, message: Message, _):
             got[0]["dur"],
         )
     )
-    basic[videoid] = True
     mystic = await message.reply_photo(IMAGE, caption=cap, reply_markup=upl)
     if DUR != "Unknown":
-        try:
-            while db[chat_id][0]["vidid"] == videoid:
-                await asyncio.sleep(5)
-                if await is_active_chat(chat_id):
-                    if basic[videoid]:
-                        if await is_music_playing(chat_id):
-                            try:
-                                buttons = queue_markup(
-                                    _,
-                                    DUR,
-                                    "c" if cplay else "g",
-                                    videoid,
-                                    seconds_to_min(db[chat_id][0]["played"]),
-                                    db[chat_id][0]["dur"],
-                                )
-                                await mystic.edit_reply_markup(reply_markup=buttons)
-                            except FloodWait:
-                                pass
-                        else:
-                            pass
-                    else:
-                        break
-                else:
-                    break
-        except:
-            return
+        Ticker.register(
+            chat_id,
+            mystic,
+            videoid,
+            lambda playing: queue_markup(
+                _,
+                DUR,
+                "c" if cplay else "g",
+                videoid,
+                seconds_to_min(playing["played"]),
+                playing["dur"],
+            ),
+        )
 
 
 @app.on_callback_query(filters.regex("GetTimer") & ~BANNED_USERS)
@@ -153,7 +138,7 @@ async def queued_tracks(client, CallbackQuery: CallbackQuery, _):
     if len(got) == 1:
         return await CallbackQuery.answer(_["queue_5"], show_alert=True)
     await CallbackQuery.answer()
-    basic[videoid] = False
+    Ticker.unregister(CallbackQuery.message)
     buttons = queue_back_markup(_, what)
     med = InputMediaPhoto(
         media="https://telegra.ph//file/6f7d35131f69951c74ee5.jpg",
@@ -171,7 +156,8 @@ async def queued_tracks(client, CallbackQuery: CallbackQuery, _):
         else:
             msg += f'✨ Title : {x["title"]}\nDuration : {x["dur"]}\nBy : {x["by"]}\n\n'
     if "Queued" in msg:
-        if len(msg) < 700:
+        if len(msg) < 700 or Load.degraded:
+            msg = msg[:4000]
             await asyncio.sleep(1)
             return await CallbackQuery.edit_message_text(msg, reply_markup=buttons)
         if "✨" in msg:
@@ -236,34 +222,19 @@ async def queue_back(client, CallbackQuery: CallbackQuery, _):
             got[0]["dur"],
         )
     )
-    basic[videoid] = True
-
     med = InputMediaPhoto(media=IMAGE, caption=cap)
     mystic = await CallbackQuery.edit_message_media(media=med, reply_markup=upl)
     if DUR != "Unknown":
-        try:
-            while db[chat_id][0]["vidid"] == videoid:
-                await asyncio.sleep(5)
-                if await is_active_chat(chat_id):
-                    if basic[videoid]:
-                        if await is_music_playing(chat_id):
-                            try:
-                                buttons = queue_markup(
-                                    _,
-                                    DUR,
-                                    cplay,
-                                    videoid,
-                                    seconds_to_min(db[chat_id][0]["played"]),
-                                    db[chat_id][0]["dur"],
-                                )
-                                await mystic.edit_reply_markup(reply_markup=buttons)
-                            except FloodWait:
-                                pass
-                        else:
-                            pass
-                    else:
-                        break
-                else:
-                    break
-        except:
-            return
+        Ticker.register(
+            chat_id,
+            mystic,
+            videoid,
+            lambda playing: queue_markup(
+                _,
+                DUR,
+                cplay,
+                videoid,
+                seconds_to_min(playing["played"]),
+                playing["dur"],
+            ),
+        )
@@ -0,0 +1,143 @@
+import itertools
+import time
+
+import config
+
+
+class TokenBucket:
+    __slots__ = ("capacity", "rate", "tokens", "updated")
+
+    def __init__(self, capacity: float, rate: float):
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now: float) -> float:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return self.tokens
+
+    def wait_for(self, cost: float) -> float:
+        """Seconds until ``cost`` tokens are available (0 if they already are)."""
+        if self.tokens >= cost:
+            return 0.0
+        if not self.rate:
+            return float("inf")
+        return (cost - self.tokens) / self.rate
+
+
+def _parse_costs(raw: str) -> dict:
+    costs = {}
+    for item in raw.split(","):
+        if "=" not in item:
+            continue
+        name, value = item.split("=", 1)
+        try:
+            costs[name.strip()] = float(value)
+        except ValueError:
+            continue
+    return costs
+
+
+class AdmissionControl:
+    """
+    Per-user, per-chat and global token buckets guarding /play and search.
+
+    An operation is admitted only when every bucket it touches holds enough
+    tokens, so a rejected request never drains the others. Inline queries,
+    sent on nearly every keystroke, draw from per-user and global buckets of
+    their own so typing searches cannot starve /play. Past
+    ``ADMISSION_MAX_TRACKED`` buckets the least recently used are dropped.
+    """
+
+    def __init__(self):
+        self.costs = {"play": 1.0, "search": 1.0, "telegram": 3.0, "inline": 1.0}
+        self.costs.update(_parse_costs(config.ADMISSION_COSTS))
+        self.user_limits = (config.ADMISSION_USER_BURST, config.ADMISSION_USER_RATE)
+        self.chat_limits = (config.ADMISSION_CHAT_BURST, config.ADMISSION_CHAT_RATE)
+        self.inline_limits = (config.ADMISSION_INLINE_BURST, config.ADMISSION_INLINE_RATE)
+        self.glob = TokenBucket(config.ADMISSION_GLOBAL_BURST, config.ADMISSION_GLOBAL_RATE)
+        self.inline_glob = TokenBucket(
+            config.ADMISSION_INLINE_GLOBAL_BURST, config.ADMISSION_INLINE_GLOBAL_RATE
+        )
+        self.users = {}
+        self.inline_users = {}
+        self.chats = {}
+        self.admitted = 0
+        self.rejected = {"user": 0, "chat": 0, "global": 0}
+
+    def cost(self, operation: str, units: int = 1) -> float:
+        return self.costs.get(operation, 1.0) * max(units, 1)
+
+    def check(self, operation: str, user_id: int, chat_id: int = None, units: int = 1) -> float:
+        """
+        Charge ``operation`` to the user, chat and global buckets.
+
+        Returns 0 when admitted, otherwise the seconds to wait before retrying.
+        """
+        now = time.monotonic()
+        cost = self.cost(operation, units)
+        if operation == "inline":
+            glob = self.inline_glob
+            user = self._bucket(self.inline_users, user_id, self.inline_limits, now)
+        else:
+            glob = self.glob
+            user = self._bucket(self.users, user_id, self.user_limits, now)
+        buckets = [("global", glob), ("user", user)]
+        if chat_id is not None and chat_id != user_id:
+            buckets.append(("chat", self._bucket(self.chats, chat_id, self.chat_limits, now)))
+        wait, scope = 0.0, None
+        for name, bucket in buckets:
+            bucket.refill(now)
+            need = min(cost, bucket.capacity)
+            bucket_wait = bucket.wait_for(need)
+            if bucket_wait > wait:
+                wait, scope = bucket_wait, name
+        if wait:
+            self.rejected[scope] += 1
+            return wait
+        for _, bucket in buckets:
+            bucket.tokens -= min(cost, bucket.capacity)
+        self.admitted += 1
+        return 0.0
+
+    def _bucket(self, store: dict, key: int, limits, now: float) -> TokenBucket:
+        # Re-inserting keeps the dict in least-recently-used order.
+        bucket = store.pop(key, None)
+        if bucket is None:
+            if len(store) >= config.ADMISSION_MAX_TRACKED:
+                self._prune(store, now)
+            bucket = TokenBucket(*limits)
+        store[key] = bucket
+        return bucket
+
+    @staticmethod
+    def _prune(store: dict, now: float):
+        for key in [k for k, b in store.items() if b.refill(now) >= b.capacity]:
+            store.pop(key, None)
+        excess = len(store) - config.ADMISSION_MAX_TRACKED + 1
+        for key in list(itertools.islice(store, max(excess, 0))):
+            store.pop(key, None)
+
+    def snapshot(self, limit: int = 10) -> dict:
+        """Current bucket state, busiest users and chats first."""
+        now = time.monotonic()
+
+        def busiest(store):
+            rows = [(key, bucket.refill(now), bucket.capacity) for key, bucket in store.items()]
+            rows.sort(key=lambda x: x[1] / (x[2] or 1))
+            return rows[:limit]
+
+        return {
+            "global": (self.glob.refill(now), self.glob.capacity),
+            "users": busiest(self.users),
+            "chats": busiest(self.chats),
+            "tracked": (len(self.users), len(self.chats)),
+            "admitted": self.admitted,
+            "rejected": dict(self.rejected),
+            "costs": dict(self.costs),
+        }
+
+
+Admission = AdmissionControl()
@@ -0,0 +1,92 @@
+import asyncio
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    In-memory LRU cache whose entries also expire after ``ttl`` seconds.
+
+    Lookups refresh recency but not expiry, so hot entries are still
+    re-fetched once they go stale.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        item = self._data.get(key)
+        if item is None:
+            self.misses += 1
+            return default
+        expires, value = item
+        if expires < time.monotonic():
+            self._data.pop(key, None)
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key, value, ttl: float = None):
+        self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        item = self._data.pop(key, None)
+        return default if item is None else item[1]
+
+    def clear(self):
+        self._data.clear()
+
+    def __contains__(self, key):
+        item = self._data.get(key)
+        return item is not None and item[0] >= time.monotonic()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class SingleFlight:
+    """
+    Runs one call per key at a time; concurrent callers share its result.
+
+    The call is cancelled once every caller waiting on it has been
+    cancelled, and the last one returns only after the call has stopped.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._waiters = {}
+
+    async def do(self, key, factory):
+        future = self._calls.get(key)
+        if future is None:
+            future = asyncio.ensure_future(factory())
+            self._calls[key] = future
+            future.add_done_callback(lambda f: self._forget(key, f))
+        self._waiters[future] = self._waiters.get(future, 0) + 1
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            if self._waiters.get(future) == 1 and not future.done():
+                future.cancel()
+                await asyncio.wait({future})
+            raise
+        finally:
+            self._waiters[future] = self._waiters.get(future, 1) - 1
+            if self._waiters[future] <= 0:
+                self._waiters.pop(future, None)
+
+    def _forget(self, key, future):
+        if self._calls.get(key) is future:
+            self._calls.pop(key, None)
+
+    def __contains__(self, key):
+        return key in self._calls
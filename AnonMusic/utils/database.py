@@ -1,8 +1,11 @@
 import random
+from datetime import datetime
 from typing import Dict, List, Union
 
+import config
 from AnonMusic import userbot
 from AnonMusic.core.mongo import mongodb
+from AnonMusic.utils.cache import TTLCache
 
 authdb = mongodb.adminauth
 authuserdb = mongodb.authuser
@@ -18,10 +21,12 @@ langdb = mongodb.language
 onoffdb = mongodb.onoffper
 playmodedb = mongodb.playmode
 playtypedb = mongodb.playtypedb
+qualitydb = mongodb.quality
 skipdb = mongodb.skipmode
 sudoersdb = mongodb.sudoers
 usersdb = mongodb.tgusersdb
 afkdb = mongodb.afk
+ytmatchdb = mongodb.ytmatch
 
 # Shifting to memory [mongo sucks often]
 active = []
@@ -37,7 +42,11 @@ nonadmin = {}
 pause = {}
 playmode = {}
 playtype = {}
+quality = {}
 skipmode = {}
+ytmatch = TTLCache(config.MATCH_CACHE_SIZE, config.MATCH_CACHE_TTL)
+ytmatch_indexed = []
+ytmatch_saves = [0]
 
 #____________________________________[ AFK DATABASE ]____________________________________
 
@@ -337,6 +346,25 @@ async def set_playmode(chat_id: int, mode: str):
     )
 
 
+async def get_quality(chat_id: int) -> str:
+    mode = quality.get(chat_id)
+    if not mode:
+        mode = await qualitydb.find_one({"chat_id": chat_id})
+        if not mode:
+            quality[chat_id] = "auto"
+            return "auto"
+        quality[chat_id] = mode["mode"]
+        return mode["mode"]
+    return mode
+
+
+async def set_quality(chat_id: int, mode: str):
+    quality[chat_id] = mode
+    await qualitydb.update_one(
+        {"chat_id": chat_id}, {"$set": {"mode": mode}}, upsert=True
+    )
+
+
 async def get_lang(chat_id: int) -> str:
     mode = langm.get(chat_id)
     if not mode:
@@ -700,3 +728,49 @@ async def remove_banned_user(user_id: int):
     if not is_gbanned:
         return
     return await blockeddb.delete_one({"user_id": user_id})
+
+
+#____________________________________[ YOUTUBE MATCHES ]____________________________________
+
+async def get_yt_match(key: str) -> Union[dict, None]:
+    match = ytmatch.get(key)
+    if match:
+        return match
+    found = await ytmatchdb.find_one({"key": key})
+    if not found:
+        return None
+    age = (datetime.utcnow() - found["at"]).total_seconds()
+    if age > config.MATCH_CACHE_TTL:
+        return None
+    match = found["match"]
+    ytmatch.set(key, match, config.MATCH_CACHE_TTL - age)
+    return match
+
+
+async def save_yt_match(key: str, match: dict):
+    ytmatch.set(key, match)
+    if not ytmatch_indexed:
+        ytmatch_indexed.append(True)
+        try:
+            await ytmatchdb.create_index("key", unique=True)
+            await ytmatchdb.create_index("at", expireAfterSeconds=config.MATCH_CACHE_TTL)
+        except:
+            pass
+    await ytmatchdb.update_one(
+        {"key": key},
+        {"$set": {"match": match, "at": datetime.utcnow()}},
+        upsert=True,
+    )
+    ytmatch_saves[0] += 1
+    if ytmatch_saves[0] % 100 == 0:
+        await _trim_yt_matches()
+
+
+async def _trim_yt_matches():
+    excess = await ytmatchdb.estimated_document_count() - config.MATCH_STORE_MAX
+    if excess <= 0:
+        return
+    oldest = ytmatchdb.find({}, {"_id": 1}).sort("at", 1).limit(excess)
+    ids = [doc["_id"] async for doc in oldest]
+    if ids:
+        await ytmatchdb.delete_many({"_id": {"$in": ids}})
@@ -1,4 +1,6 @@
 import asyncio
+from math import ceil
+
 from pyrogram.enums import ChatMemberStatus
 from pyrogram.errors import (
     ChatAdminRequired,
@@ -10,6 +12,7 @@ from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup, Message
 
 from AnonMusic import YouTube, app
 from AnonMusic.misc import SUDOERS
+from AnonMusic.utils.admission import Admission
 from AnonMusic.utils.database import (
     get_assistant,
     get_cmode,
@@ -20,7 +23,8 @@ from AnonMusic.utils.database import (
     is_maintenance,
 )
 from AnonMusic.utils.inline import botplaylist_markup
-from config import PLAYLIST_IMG_URL, SUPPORT_CHAT, adminlist
+from AnonMusic.utils.tracing import Tracer, span
+from config import PLAYLIST_FETCH_LIMIT, PLAYLIST_IMG_URL, SUPPORT_CHAT, adminlist
 from strings import get_string
 
 links = {}
@@ -28,7 +32,8 @@ links = {}
 
 def PlayWrapper(command):
     async def wrapper(client, message:Message):
-        language = await get_lang(message.chat.id)
+        with span("get_lang"):
+            language = await get_lang(message.chat.id)
         _ = get_string(language)
         if message.sender_chat:
             upl = InlineKeyboardMarkup(
@@ -43,18 +48,15 @@ def PlayWrapper(command):
             )
             return await message.reply_text(_["general_3"], reply_markup=upl)          
 
-        if await is_maintenance() is False:
+        with span("maintenance"):
+            maintenance = await is_maintenance()
+        if maintenance is False:
             if message.from_user.id not in SUDOERS:
                 return await message.reply_text(
                     text=f"{app.mention} ɪs ᴜɴᴅᴇʀ ᴍᴀɪɴᴛᴇɴᴀɴᴄᴇ, ᴠɪsɪᴛ <a href={SUPPORT_CHAT}>sᴜᴘᴘᴏʀᴛ ᴄʜᴀᴛ</a> ғᴏʀ ᴋɴᴏᴡɪɴɢ ᴛʜᴇ ʀᴇᴀsᴏɴ.",
                     disable_web_page_preview=True,
                 )
 
-        try:
-            await message.delete()
-        except:
-            pass
-
         audio_telegram = (
             (message.reply_to_message.audio or message.reply_to_message.voice)
             if message.reply_to_message
@@ -66,6 +68,25 @@ def PlayWrapper(command):
             else None
         )
         url = await YouTube.url(message)
+        requested = audio_telegram or video_telegram or url or len(message.command) > 1
+        if requested and message.from_user.id not in SUDOERS:
+            if audio_telegram or video_telegram:
+                operation, units = "telegram", 1
+            elif url:
+                operation, units = "play", 1
+            else:
+                operation = "search"
+                units = len([x for x in message.text.split("\n") if x.strip()])
+                units = min(units, PLAYLIST_FETCH_LIMIT)
+            wait = Admission.check(operation, message.from_user.id, message.chat.id, units)
+            if wait:
+                return await message.reply_text(_["admission_1"].format(ceil(wait)))
+
+        try:
+            await message.delete()
+        except:
+            pass
+
         if audio_telegram is None and video_telegram is None and url is None:
             if len(message.command) < 2:
                 if "stream" in message.command:
@@ -113,13 +134,15 @@ def PlayWrapper(command):
             fplay = None
 
         if not await is_active_chat(chat_id):
-            userbot = await get_assistant(chat_id)
+            with span("get_assistant"):
+                userbot = await get_assistant(chat_id)
             try:
                 try:
-                    try:
-                        get = await app.get_chat_member(chat_id, int(userbot.id))
-                    except:
-                        get = await app.get_chat_member(chat_id, userbot.username)
+                    with span("get_chat_member"):
+                        try:
+                            get = await app.get_chat_member(chat_id, int(userbot.id))
+                        except:
+                            get = await app.get_chat_member(chat_id, userbot.username)
                 except ChatAdminRequired:
                     return await message.reply_text(_["call_1"])
                 if (
@@ -158,7 +181,8 @@ def PlayWrapper(command):
                 myu = await message.reply_text(_["call_4"].format(app.mention))
                 try:
                     await asyncio.sleep(1)
-                    await userbot.join_chat(invitelink)
+                    with span("join_chat"):
+                        await userbot.join_chat(invitelink)
                 except InviteRequestSent:
                     try:
                         await app.approve_chat_join_request(chat_id, userbot.id)
@@ -194,4 +218,9 @@ def PlayWrapper(command):
             fplay,
         )
 
-    return wrapper
+    async def traced_wrapper(client, message: Message):
+        user_id = message.from_user.id if message.from_user else None
+        with Tracer.trace(message.chat.id, user_id, message.text):
+            return await wrapper(client, message)
+
+    return traced_wrapper
@@ -0,0 +1,166 @@
+import asyncio
+import multiprocessing
+import os
+import signal
+
+import config
+from extraction_worker import serve
+from AnonMusic.logging import LOGGER
+from AnonMusic.utils.cache import SingleFlight, TTLCache
+
+
+class _Worker:
+    __slots__ = ("process", "conn", "jobs")
+
+    def __init__(self, context):
+        self.conn, child = context.Pipe()
+        self.process = context.Process(target=serve, args=(child,), daemon=True)
+        self.process.start()
+        child.close()
+        self.jobs = 0
+
+    def alive(self) -> bool:
+        return self.process.is_alive()
+
+    def stop(self, kill: bool = False):
+        try:
+            if kill:
+                try:
+                    os.killpg(self.process.pid, signal.SIGKILL)
+                except OSError:
+                    self.process.kill()
+            else:
+                self.conn.send(None)
+        except Exception:
+            pass
+        self.conn.close()
+
+
+class ExtractionError(Exception):
+    pass
+
+
+class ExtractionPool:
+    """
+    yt-dlp extraction on a pool of worker processes.
+
+    Workers are forked from a forkserver that preloaded yt_dlp and nothing
+    of the bot, so they inherit none of its threads, locks or sockets. They
+    take jobs over a pipe, so signature
+    deciphering and JSON parsing never hold the bot's GIL. Each job has a
+    timeout, after which its worker is killed and replaced, and workers are
+    recycled after ``EXTRACT_MAX_JOBS`` jobs to cap memory growth.
+
+    Info dicts are cached per URL and options; concurrent requests for the
+    same URL, or downloads of the same file, share one job.
+    """
+
+    def __init__(self):
+        self.size = config.EXTRACT_WORKERS
+        self.max_jobs = config.EXTRACT_MAX_JOBS
+        self.timeout = config.EXTRACT_TIMEOUT
+        self.infos = TTLCache(config.EXTRACT_CACHE_SIZE, config.EXTRACT_CACHE_TTL)
+        self.flights = SingleFlight()
+        self.recycled = 0
+        self.timeouts = 0
+        self._context = multiprocessing.get_context("forkserver")
+        self._context.set_forkserver_preload(["extraction_worker"])
+        self._idle = None
+
+    def _ensure_pool(self):
+        if self._idle is None:
+            self._idle = asyncio.Queue()
+            for _ in range(self.size):
+                self._idle.put_nowait(None)
+
+    async def _call(
+        self, url: str, opts: dict, download: bool, timeout: float = None, info: dict = None
+    ):
+        self._ensure_pool()
+        worker = await self._idle.get()
+        try:
+            if worker is None or not worker.alive():
+                if worker is not None:
+                    worker.stop(kill=True)
+                worker = _Worker(self._context)
+            worker.conn.send((url, opts, download, info))
+            ok, result = await asyncio.wait_for(
+                self._receive(worker), timeout or self.timeout
+            )
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            LOGGER(__name__).warning(f"Extraction of {url} timed out, killing its worker")
+            worker.stop(kill=True)
+            worker = None
+            raise ExtractionError(f"Extraction of {url} timed out")
+        except BaseException:
+            if worker is not None:
+                worker.stop(kill=True)
+                worker = None
+            raise
+        finally:
+            if worker is not None:
+                worker.jobs += 1
+                if worker.jobs >= self.max_jobs:
+                    worker.stop()
+                    worker = None
+                    self.recycled += 1
+            self._idle.put_nowait(worker)
+        if not ok:
+            raise ExtractionError(result)
+        return result
+
+    async def _receive(self, worker):
+        loop = asyncio.get_running_loop()
+        ready = loop.create_future()
+        fd = worker.conn.fileno()
+        loop.add_reader(fd, lambda: ready.done() or ready.set_result(None))
+        try:
+            await ready
+        finally:
+            loop.remove_reader(fd)
+        try:
+            return worker.conn.recv()
+        except EOFError:
+            raise ExtractionError("Extraction worker died")
+
+    @staticmethod
+    def _key(url: str, opts: dict) -> tuple:
+        return (url, repr(sorted(opts.items())))
+
+    async def info(self, url: str, opts: dict) -> dict:
+        """Metadata for ``url`` without downloading, served from cache when possible."""
+        key = self._key(url, opts)
+        info = self.infos.get(key)
+        if info is not None:
+            return info
+
+        async def extract():
+            info = await self._call(url, opts, False)
+            self.infos.set(key, info)
+            return info
+
+        return await self.flights.do(("info",) + key, extract)
+
+    async def download(
+        self, url: str, opts: dict, target: str, timeout: float = None, info: dict = None
+    ) -> dict:
+        """
+        Download ``url`` once even if several chats ask for ``target`` together.
+
+        Passing an ``info`` dict from ``info()`` skips extracting the page
+        again. The returned info dict carries the written file under
+        ``filepath``.
+        """
+
+        async def fetch():
+            result = await self._call(
+                url, opts, True, timeout or config.EXTRACT_DOWNLOAD_TIMEOUT, info
+            )
+            self.infos.set(self._key(url, opts), result)
+            return result
+
+        return await self.flights.do(("download", target), fetch)
+
+
+Extractor = ExtractionPool()
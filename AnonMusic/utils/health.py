@@ -0,0 +1,163 @@
+import asyncio
+import time
+
+from aiohttp import web
+
+import config
+from AnonMusic import app
+from AnonMusic.core import metrics
+from AnonMusic.core.metrics import MONGO_LISTENER, Gauge
+from AnonMusic.core.mongo import mongodb
+from AnonMusic.logging import LOGGER
+from AnonMusic.misc import db
+from AnonMusic.utils.database import active, activevideo, assistantdict
+from AnonMusic.utils.load import Load
+from AnonMusic.utils.outbound import PRIORITY_NAMES, Outbound
+from AnonMusic.utils.quality import Quality
+from AnonMusic.utils.transcode import CLASS_NAMES, Jobs, Probes
+from AnonMusic.utils.watchdog import Watchdog
+
+_mongo_state = {"ok": False, "checked": 0.0, "error": None}
+
+
+def _assistant_clients() -> dict:
+    from AnonMusic.core.call import Anony
+
+    return {
+        num: getattr(Anony, f"userbot{num}", None)
+        for num, string in enumerate(
+            [config.STRING1, config.STRING2, config.STRING3, config.STRING4, config.STRING5],
+            start=1,
+        )
+        if string
+    }
+
+
+def _active_calls():
+    counts = {}
+    for chat_id in list(active):
+        num = assistantdict.get(chat_id, "unknown")
+        counts[num] = counts.get(num, 0) + 1
+    return [((num,), value) for num, value in counts.items()]
+
+
+def _queue_lengths():
+    return [((chat_id,), len(queue)) for chat_id, queue in list(db.items()) if queue]
+
+
+def _assistants_up():
+    return [
+        ((num,), int(bool(client and client.is_connected)))
+        for num, client in _assistant_clients().items()
+    ]
+
+
+Gauge("anon_active_calls", "Active voice chats per assistant", ("assistant",), _active_calls)
+Gauge("anon_active_video_calls", "Active video chats", collect=lambda: len(activevideo))
+Gauge("anon_queue_length", "Tracks queued per chat", ("chat_id",), _queue_lengths)
+Gauge("anon_assistant_up", "Assistant client connected", ("assistant",), _assistants_up)
+Gauge(
+    "anon_floodwaits_total",
+    "FloodWait errors seen by the outbound scheduler",
+    collect=lambda: Outbound.flood_waits,
+    kind="counter",
+)
+Gauge(
+    "anon_outbound_queue_depth",
+    "Outbound jobs waiting per priority",
+    ("priority",),
+    lambda: [((name,), depth) for name, depth in Outbound.queue_depth().items()],
+)
+Gauge(
+    "anon_outbound_sent_total",
+    "Outbound jobs delivered per priority",
+    ("priority",),
+    lambda: [((name,), Outbound.sent[i]) for i, name in enumerate(PRIORITY_NAMES)],
+    kind="counter",
+)
+Gauge(
+    "anon_transcode_queue_depth",
+    "ffmpeg jobs waiting per priority",
+    ("priority",),
+    lambda: [((name,), depth) for name, depth in Jobs.queue_depth().items()],
+)
+Gauge("anon_transcode_running", "ffmpeg jobs running", collect=lambda: Jobs.active)
+Gauge("anon_probe_running", "ffprobe runs in progress", collect=lambda: Probes.active)
+Gauge(
+    "anon_transcode_completed_total",
+    "ffmpeg jobs finished per priority",
+    ("priority",),
+    lambda: [((name,), Jobs.completed[i]) for i, name in enumerate(CLASS_NAMES)],
+    kind="counter",
+)
+Gauge("anon_event_loop_lag_seconds", "Smoothed event-loop lag", collect=lambda: Load.lag)
+Gauge("anon_cpu_percent", "Host CPU usage", collect=lambda: Load.cpu)
+Gauge("anon_degraded", "Load shedding active", collect=lambda: int(Load.degraded))
+Gauge("anon_quality_level", "Global stream quality tier, 0 is best", collect=lambda: Quality.level)
+Gauge(
+    "anon_loop_stalls_total",
+    "Event-loop stalls caught by the watchdog",
+    collect=lambda: Watchdog.stalls,
+    kind="counter",
+)
+
+
+async def mongo_healthy() -> bool:
+    """Ping Mongo, reusing the last answer for ``HEALTH_MONGO_TTL`` seconds."""
+    now = time.monotonic()
+    if now - _mongo_state["checked"] < config.HEALTH_MONGO_TTL:
+        return _mongo_state["ok"]
+    _mongo_state["checked"] = now
+    try:
+        await asyncio.wait_for(mongodb.command("ping"), timeout=config.HEALTH_MONGO_TIMEOUT)
+        _mongo_state["ok"], _mongo_state["error"] = True, None
+    except Exception as e:
+        _mongo_state["ok"], _mongo_state["error"] = False, f"{type(e).__name__}: {e}"
+    return _mongo_state["ok"]
+
+
+async def _metrics(request):
+    return web.Response(text=metrics.render(), content_type="text/plain", charset="utf-8")
+
+
+async def _healthz(request):
+    alive = Load.lag < config.HEALTH_MAX_LAG
+    return web.json_response(
+        {"alive": alive, "loop_lag": round(Load.lag, 4)}, status=200 if alive else 503
+    )
+
+
+async def _readyz(request):
+    assistants = {str(num): bool(c and c.is_connected) for num, c in _assistant_clients().items()}
+    mongo = await mongo_healthy()
+    bot = bool(app.is_connected)
+    ready = bot and mongo and any(assistants.values())
+    body = {
+        "ready": ready,
+        "bot": bot,
+        "mongo": mongo,
+        "mongo_error": _mongo_state["error"],
+        "mongo_last_ok": round(time.monotonic() - MONGO_LISTENER.last_ok, 1)
+        if MONGO_LISTENER.last_ok
+        else None,
+        "assistants": assistants,
+        "degraded": Load.degraded,
+    }
+    return web.json_response(body, status=200 if ready else 503)
+
+
+async def start_health_server():
+    if not config.METRICS_PORT:
+        return None
+    server = web.Application()
+    server.router.add_get("/metrics", _metrics)
+    server.router.add_get("/healthz", _healthz)
+    server.router.add_get("/readyz", _readyz)
+    runner = web.AppRunner(server, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, config.METRICS_HOST, config.METRICS_PORT)
+    await site.start()
+    LOGGER(__name__).info(
+        f"📈 Metrics and health probes on {config.METRICS_HOST}:{config.METRICS_PORT}"
+    )
+    return runner
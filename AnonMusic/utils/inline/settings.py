@@ -14,6 +14,7 @@ def setting_markup(_):
         ],
         [
             InlineKeyboardButton(text=_["ST_B_4"], callback_data="VM"),
+            InlineKeyboardButton(text=_["ST_B_15"], callback_data="QM"),
         ],
         [
             InlineKeyboardButton(text=_["CLOSE_BUTTON"], callback_data="close"),
@@ -22,6 +23,33 @@ def setting_markup(_):
     return buttons
 
 
+def quality_markup(_, current: str):
+    def option(mode, key):
+        text = _[key]
+        if mode == current:
+            text = f"✅ {text}"
+        return InlineKeyboardButton(text=text, callback_data=f"QUALITY {mode}")
+
+    buttons = [
+        [
+            InlineKeyboardButton(text=_["ST_B_16"], callback_data="QUALITYANSWER"),
+        ],
+        [
+            option("auto", "ST_B_17"),
+            option("medium", "ST_B_18"),
+            option("low", "ST_B_19"),
+        ],
+        [
+            InlineKeyboardButton(
+                text=_["BACK_BUTTON"],
+                callback_data="settings_helper",
+            ),
+            InlineKeyboardButton(text=_["CLOSE_BUTTON"], callback_data="close"),
+        ],
+    ]
+    return buttons
+
+
 def vote_mode_markup(_, current, mode: Union[bool, str] = None):
     buttons = [
         [
@@ -0,0 +1,68 @@
+import asyncio
+
+import psutil
+
+import config
+from AnonMusic.logging import LOGGER
+
+
+class LoadMonitor:
+    """
+    Samples event-loop lag and host CPU and flips a degraded flag.
+
+    Entering degraded mode needs either metric above its threshold, leaving
+    it needs both below ``LOAD_RECOVER_RATIO`` of their thresholds for
+    ``LOAD_RECOVER_SAMPLES`` consecutive samples.
+    """
+
+    def __init__(self):
+        self.interval = config.LOAD_SAMPLE_INTERVAL
+        self.lag_threshold = config.LOAD_LAG_THRESHOLD
+        self.cpu_threshold = config.LOAD_CPU_THRESHOLD
+        self.lag = 0.0
+        self.cpu = 0.0
+        self.degraded = False
+        self.transitions = 0
+        self._calm = 0
+        self._task = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            psutil.cpu_percent(interval=None)
+            self._task = asyncio.create_task(self._run())
+
+    def overloaded(self) -> bool:
+        return self.lag > self.lag_threshold or self.cpu > self.cpu_threshold
+
+    def calm(self) -> bool:
+        ratio = config.LOAD_RECOVER_RATIO
+        return self.lag < self.lag_threshold * ratio and self.cpu < self.cpu_threshold * ratio
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - started - self.interval)
+            self.lag = lag if lag > self.lag else self.lag * 0.7 + lag * 0.3
+            self.cpu = psutil.cpu_percent(interval=None)
+            self._update()
+
+    def _update(self):
+        if not self.degraded:
+            if self.overloaded():
+                self.degraded = True
+                self.transitions += 1
+                self._calm = 0
+                LOGGER(__name__).warning(
+                    f"Entering degraded mode (loop lag {self.lag * 1000:.0f}ms, cpu {self.cpu:.0f}%)"
+                )
+            return
+        self._calm = self._calm + 1 if self.calm() else 0
+        if self._calm >= config.LOAD_RECOVER_SAMPLES:
+            self.degraded = False
+            self.transitions += 1
+            LOGGER(__name__).info("Load recovered, leaving degraded mode")
+
+
+Load = LoadMonitor()
@@ -2,10 +2,14 @@ from pyrogram.enums import ParseMode
 
 from AnonMusic import app
 from AnonMusic.utils.database import is_on_off
+from AnonMusic.utils.load import Load
+from AnonMusic.utils.outbound import LOGS, Outbound
 from config import LOGGER_ID
 
 
 async def play_logs(message, streamtype):
+    if Load.degraded:
+        return
     if await is_on_off(2):
         logger_text = f"""
 <b>{app.mention} ᴘʟᴀʏ ʟᴏɢ</b>
@@ -21,13 +25,13 @@ async def play_logs(message, streamtype):
 <b>ǫᴜᴇʀʏ :</b> {message.text.split(None, 1)[1]}
 <b>sᴛʀᴇᴀᴍᴛʏᴘᴇ :</b> {streamtype}"""
         if message.chat.id != LOGGER_ID:
-            try:
-                await app.send_message(
-                    chat_id=LOGGER_ID,
-                    text=logger_text,
-                    parse_mode=ParseMode.HTML,
-                    disable_web_page_preview=True,
-                )
-            except:
-                pass
+            Outbound.post(
+                LOGS,
+                LOGGER_ID,
+                app.send_message,
+                chat_id=LOGGER_ID,
+                text=logger_text,
+                parse_mode=ParseMode.HTML,
+                disable_web_page_preview=True,
+            )
         return
@@ -0,0 +1,40 @@
+import re
+
+from youtubesearchpython.__future__ import VideosSearch
+
+from AnonMusic.utils.database import get_yt_match, save_yt_match
+
+
+def normalize_query(text: str) -> str:
+    """Case-fold, drop the ``-v`` flag and collapse whitespace so equal queries share one key."""
+    text = re.sub(r"(?:^|\s)-v(?=\s|$)", " ", str(text))
+    return re.sub(r"\s+", " ", text).strip().casefold()
+
+
+async def youtube_match(query: str, key: str = None, lookup: bool = True) -> dict:
+    """
+    Top YouTube result for ``query`` as a track_details dict.
+
+    ``key`` identifies the source track (e.g. ``spotify:<id>``); without it
+    the normalized query is used. Matches are remembered in memory and in
+    Mongo, so repeat plays skip the search. Pass ``lookup=False`` when the
+    caller already checked the cache for ``key``.
+    """
+    key = key or f"q:{normalize_query(query)}"
+    match = await get_yt_match(key) if lookup else None
+    if match:
+        return match
+    results = VideosSearch(query, limit=1)
+    for result in (await results.next())["result"]:
+        match = {
+            "title": result["title"],
+            "link": result["link"],
+            "vidid": result["id"],
+            "duration_min": result["duration"],
+            "thumb": result["thumbnails"][0]["url"].split("?")[0],
+        }
+        break
+    if not match:
+        raise ValueError(f"No YouTube result for {query!r}")
+    await save_yt_match(key, match)
+    return match
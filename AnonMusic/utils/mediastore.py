@@ -0,0 +1,155 @@
+import asyncio
+import hashlib
+import json
+import os
+import time
+
+import config
+from AnonMusic.logging import LOGGER
+from config import autoclean
+
+
+async def _run(func, *args):
+    return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+
+class MediaStore:
+    """
+    Local media files addressed by their canonical source id.
+
+    Keys look like ``yt:<id>:audio``, ``sc:<id>`` or ``tg:<file_unique_id>``
+    and map to ``<root>/<hh>/<sha1(key)>.<ext>``. A JSON index next to the
+    files records codec, duration, size and last access; the least recently
+    used files that are not queued anywhere are evicted past
+    ``MEDIA_STORE_MAX_MB``. File system calls run in the default executor
+    and index writes are batched, so the event loop never waits on disk.
+    """
+
+    def __init__(self):
+        self.root = os.path.realpath(config.MEDIA_STORE_DIR)
+        self.max_bytes = config.MEDIA_STORE_MAX_MB * 1024 * 1024
+        self.index_path = os.path.join(self.root, "index.json")
+        self.index = {}
+        self.hits = 0
+        self.misses = 0
+        self._saving = None
+        os.makedirs(self.root, exist_ok=True)
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.index_path) as f:
+                self.index = json.load(f)
+        except FileNotFoundError:
+            self.index = {}
+        except Exception as e:
+            LOGGER(__name__).warning(f"Media index unreadable, starting empty: {e}")
+            self.index = {}
+
+    def _write(self, index: dict):
+        tmp = f"{self.index_path}.tmp"
+        try:
+            with open(tmp, "w") as f:
+                json.dump(index, f)
+            os.replace(tmp, self.index_path)
+        except Exception as e:
+            LOGGER(__name__).warning(f"Failed to save media index: {e}")
+
+    def _save(self):
+        """Write the index once, shortly after the last of a burst of changes."""
+        if self._saving is None or self._saving.done():
+            self._saving = asyncio.create_task(self._save_later())
+
+    async def _save_later(self):
+        await asyncio.sleep(1)
+        index = {key: dict(entry) for key, entry in self.index.items()}
+        await _run(self._write, index)
+
+    def path_for(self, key: str, ext: str) -> str:
+        digest = hashlib.sha1(key.encode()).hexdigest()
+        folder = os.path.join(self.root, digest[:2])
+        os.makedirs(folder, exist_ok=True)
+        return os.path.join(folder, f"{digest}.{ext.lstrip('.') or 'bin'}")
+
+    def owns(self, path: str) -> bool:
+        return bool(path) and os.path.realpath(str(path)).startswith(self.root + os.sep)
+
+    async def get(self, key: str):
+        """Stored path for ``key``, or None if missing or incomplete."""
+        entry = self.index.get(key)
+        if entry:
+            path = entry["path"]
+            try:
+                complete = await _run(os.path.getsize, path) == entry["size"]
+            except OSError:
+                complete = False
+            if complete:
+                entry["last_access"] = int(time.time())
+                self.hits += 1
+                return path
+            self.index.pop(key, None)
+            self._save()
+        self.misses += 1
+        return None
+
+    async def put(self, key: str, path: str, codec: str = None, duration: int = None) -> str:
+        """
+        Record ``path`` under ``key`` and return its stored location.
+
+        Files outside the store are moved in; files already at
+        ``path_for(key, ...)`` stay where they are.
+        """
+        ext = os.path.splitext(path)[1].lstrip(".")
+        target = path if self.owns(path) else self.path_for(key, ext)
+        size = await _run(self._move, path, target)
+        now = int(time.time())
+        self.index[key] = {
+            "path": target,
+            "codec": codec or ext,
+            "duration": duration,
+            "size": size,
+            "created": now,
+            "last_access": now,
+        }
+        evicted = self._evict()
+        if evicted:
+            await _run(self._remove, evicted)
+        self._save()
+        return target
+
+    @staticmethod
+    def _move(path: str, target: str) -> int:
+        if os.path.realpath(path) != os.path.realpath(target):
+            os.replace(path, target)
+        return os.path.getsize(target)
+
+    @staticmethod
+    def _remove(paths):
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def usage(self) -> int:
+        return sum(entry["size"] for entry in self.index.values())
+
+    def _evict(self) -> list:
+        """Drop index entries past the size limit and return their paths."""
+        total = self.usage()
+        if total <= self.max_bytes:
+            return []
+        queued = set(autoclean)
+        evicted = []
+        for key, entry in sorted(self.index.items(), key=lambda x: x[1]["last_access"]):
+            if total <= self.max_bytes:
+                break
+            if entry["path"] in queued:
+                continue
+            evicted.append(entry["path"])
+            total -= entry["size"]
+            self.index.pop(key, None)
+        return evicted
+
+
+Store = MediaStore()
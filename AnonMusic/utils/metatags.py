@@ -0,0 +1,81 @@
+import codecs
+from html.parser import HTMLParser
+
+
+class _HeadDone(Exception):
+    pass
+
+
+class MetaExtractor(HTMLParser):
+    """
+    Collects ``<meta property=... content=...>`` values from a page head.
+
+    Parsing stops at ``</head>`` / ``<body>``, or as soon as every property
+    in ``enough`` has been seen.
+    """
+
+    def __init__(self, properties, enough=(), charset=None):
+        super().__init__(convert_charrefs=True)
+        self.properties = set(properties)
+        self.enough = set(enough)
+        self.found = {}
+        self.done = False
+        try:
+            decoder = codecs.getincrementaldecoder(charset or "utf-8")
+        except LookupError:
+            decoder = codecs.getincrementaldecoder("utf-8")
+        self.decoder = decoder(errors="replace")
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "body":
+            raise _HeadDone
+        if tag != "meta":
+            return
+        attrs = dict(attrs)
+        prop = attrs.get("property") or attrs.get("name")
+        if prop in self.properties and attrs.get("content") is not None:
+            self.found.setdefault(prop, []).append(attrs["content"])
+            if self.enough and self.enough.issubset(self.found):
+                raise _HeadDone
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        if tag == "head":
+            raise _HeadDone
+
+    def feed_text(self, text: str) -> bool:
+        """Feed a chunk, returning True once the head has been read."""
+        try:
+            self.feed(text)
+        except _HeadDone:
+            self.done = True
+        return self.done
+
+    def feed_bytes(self, chunk: bytes, final: bool = False) -> bool:
+        """Decode and feed a chunk of the raw page, like ``feed_text``."""
+        return self.feed_text(self.decoder.decode(chunk, final=final))
+
+
+def meta_reader(properties, enough=(), chunk_size: int = 8192):
+    """
+    A ``read`` callback for ``http.fetch`` returning ``{property: [contents]}``.
+
+    Only the bytes up to the end of ``<head>`` are downloaded; the rest of
+    the body is dropped with the connection.
+    """
+
+    async def read(response):
+        if response.status != 200:
+            return {}
+        parser = MetaExtractor(properties, enough, response.charset)
+        async for chunk in response.content.iter_chunked(chunk_size):
+            if parser.feed_bytes(chunk):
+                response.close()
+                break
+        else:
+            parser.feed_bytes(b"", final=True)
+        return parser.found
+
+    return read
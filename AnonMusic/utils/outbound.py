@@ -0,0 +1,213 @@
+import asyncio
+import time
+from collections import deque
+
+from pyrogram.errors import FloodWait
+
+import config
+from AnonMusic.logging import LOGGER
+from AnonMusic.utils.tracing import span
+
+# Priority classes, lower value is dispatched first
+PLAYBACK = 0
+REPLY = 1
+COSMETIC = 2
+LOGS = 3
+BROADCAST = 4
+
+PRIORITY_NAMES = ["playback", "reply", "cosmetic", "logs", "broadcast"]
+
+
+class _Job:
+    __slots__ = ("priority", "chat_id", "func", "args", "kwargs", "key", "futures", "tries")
+
+    def __init__(self, priority, chat_id, func, args, kwargs, key):
+        self.priority = priority
+        self.chat_id = chat_id
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.key = key
+        self.futures = []
+        self.tries = 0
+
+
+class OutboundScheduler:
+    """
+    Central dispatcher for bot API send/edit calls.
+
+    Jobs are picked by priority class, spaced per chat and by a global token
+    bucket. Jobs submitted with the same ``key`` while an earlier one is still
+    queued replace it, so only the latest edit of a message goes out.
+    """
+
+    def __init__(self):
+        self.global_rate = config.OUTBOUND_GLOBAL_RATE
+        self.chat_interval = config.OUTBOUND_CHAT_INTERVAL
+        self.max_retries = config.OUTBOUND_MAX_RETRIES
+        self._queues = [deque() for _ in PRIORITY_NAMES]
+        self._pending = {}
+        self._chat_next = {}
+        self._global_next = 0.0
+        self._tokens = float(self.global_rate)
+        self._refilled = time.monotonic()
+        self._wakeup = None
+        self._worker = None
+        self._inflight = set()
+        self.sent = [0] * len(PRIORITY_NAMES)
+        self.coalesced = 0
+        self.flood_waits = 0
+        self.failed = 0
+
+    def submit(self, priority, chat_id, func, /, *args, key=None, **kwargs):
+        """Queue ``func(*args, **kwargs)`` and return a future for its result."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        job = self._pending.get(key) if key is not None else None
+        if job:
+            job.func, job.args, job.kwargs = func, args, kwargs
+            if priority < job.priority:
+                self._queues[job.priority].remove(job)
+                job.priority = priority
+                self._queues[priority].append(job)
+            self.coalesced += 1
+        else:
+            job = _Job(priority, chat_id, func, args, kwargs, key)
+            self._queues[priority].append(job)
+            if key is not None:
+                self._pending[key] = job
+        job.futures.append(future)
+        self._ensure_worker()
+        self._wakeup.set()
+        return future
+
+    async def send(self, priority, chat_id, func, /, *args, key=None, **kwargs):
+        """Queue a call and wait for it to be delivered."""
+        with span(getattr(func, "__name__", "send")):
+            return await self.submit(priority, chat_id, func, *args, key=key, **kwargs)
+
+    def post(self, priority, chat_id, func, /, *args, key=None, **kwargs):
+        """Queue a call without waiting, errors are only logged."""
+        future = self.submit(priority, chat_id, func, *args, key=key, **kwargs)
+        future.add_done_callback(_consume)
+        return future
+
+    def throttled(self, chat_id) -> float:
+        """Seconds until ``chat_id`` may receive the next message."""
+        now = time.monotonic()
+        return max(self._chat_next.get(chat_id, 0.0), self._global_next) - now
+
+    def queue_depth(self) -> dict:
+        return {PRIORITY_NAMES[i]: len(q) for i, q in enumerate(self._queues)}
+
+    def _ensure_worker(self):
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+    def _take_token(self, now) -> float:
+        elapsed = now - self._refilled
+        self._refilled = now
+        self._tokens = min(
+            float(self.global_rate), self._tokens + elapsed * self.global_rate
+        )
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.global_rate
+
+    def _next_job(self, now):
+        """Return (job, delay): the first ready job or how long to sleep."""
+        if now < self._global_next:
+            return None, self._global_next - now
+        delay = None
+        for queue in self._queues:
+            for job in queue:
+                ready_at = self._chat_next.get(job.chat_id, 0.0)
+                if ready_at <= now:
+                    queue.remove(job)
+                    return job, 0.0
+                wait = ready_at - now
+                delay = wait if delay is None else min(delay, wait)
+        return None, delay
+
+    async def _run(self):
+        while True:
+            now = time.monotonic()
+            job, delay = self._next_job(now)
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            wait = self._take_token(now)
+            if wait:
+                self._queues[job.priority].appendleft(job)
+                await asyncio.sleep(wait)
+                continue
+            if job.key is not None:
+                self._pending.pop(job.key, None)
+            self._chat_next[job.chat_id] = now + self.chat_interval
+            task = asyncio.create_task(self._deliver(job))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _deliver(self, job):
+        try:
+            result = await job.func(*job.args, **job.kwargs)
+        except FloodWait as e:
+            self.flood_waits += 1
+            wait = int(e.value or 1)
+            until = time.monotonic() + wait
+            if job.chat_id is None:
+                self._global_next = max(self._global_next, until)
+            else:
+                self._chat_next[job.chat_id] = max(
+                    self._chat_next.get(job.chat_id, 0.0), until
+                )
+            LOGGER(__name__).warning(
+                f"FloodWait of {wait}s for {PRIORITY_NAMES[job.priority]} job in {job.chat_id}"
+            )
+            job.tries += 1
+            if job.tries <= self.max_retries:
+                return self._requeue(job)
+            return self._finish(job, exc=e)
+        except Exception as e:
+            return self._finish(job, exc=e)
+        self.sent[job.priority] += 1
+        self._finish(job, result=result)
+
+    def _requeue(self, job):
+        if job.key is not None:
+            newer = self._pending.get(job.key)
+            if newer:
+                newer.futures.extend(job.futures)
+                return
+            self._pending[job.key] = job
+        self._queues[job.priority].appendleft(job)
+        self._wakeup.set()
+
+    def _finish(self, job, result=None, exc=None):
+        if exc is not None:
+            self.failed += 1
+        for future in job.futures:
+            if future.done():
+                continue
+            if exc is not None:
+                future.set_exception(exc)
+            else:
+                future.set_result(result)
+
+
+def _consume(future):
+    if future.cancelled():
+        return
+    exc = future.exception()
+    if exc is not None:
+        LOGGER(__name__).debug(f"Outbound call failed: {type(exc).__name__}: {exc}")
+
+
+Outbound = OutboundScheduler()
@@ -1,15 +1,15 @@
-import aiohttp
+import json
+
+from AnonMusic.core.http import http
 
 BASE = "https://batbin.me/"
 
 
-async def post(url: str, *args, **kwargs):
-    async with aiohttp.ClientSession() as session:
-        async with session.post(url, *args, **kwargs) as resp:
-            try:
-                data = await resp.json()
-            except Exception:
-                data = await resp.text()
+async def post(url: str, **kwargs):
+    _, data = await http.fetch("POST", url, **kwargs)
+    try:
+        return json.loads(data)
+    except Exception:
         return data
 
 
@@ -0,0 +1,142 @@
+import asyncio
+import json
+import os
+
+import config
+from AnonMusic.logging import LOGGER
+from AnonMusic.utils.cache import SingleFlight, TTLCache
+from AnonMusic.utils.transcode import USER, Probes
+
+
+def _number(value, kind=float):
+    try:
+        return kind(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class MediaInfo:
+    """What ffprobe reports about a file or stream URL."""
+
+    __slots__ = (
+        "duration",
+        "format",
+        "bitrate",
+        "audio_codec",
+        "video_codec",
+        "sample_rate",
+        "width",
+        "height",
+    )
+
+    def __init__(self, data: dict):
+        fmt = data.get("format") or {}
+        streams = data.get("streams") or []
+        audio = next((s for s in streams if s.get("codec_type") == "audio"), {})
+        video = next(
+            (
+                s
+                for s in streams
+                if s.get("codec_type") == "video"
+                and not (s.get("disposition") or {}).get("attached_pic")
+            ),
+            {},
+        )
+        self.duration = _number(fmt.get("duration"))
+        if self.duration is None:
+            self.duration = next(
+                (_number(s["duration"]) for s in streams if "duration" in s), None
+            )
+        self.format = fmt.get("format_name")
+        self.bitrate = _number(fmt.get("bit_rate"), int)
+        self.audio_codec = audio.get("codec_name")
+        self.video_codec = video.get("codec_name")
+        self.sample_rate = _number(audio.get("sample_rate"), int)
+        self.width = _number(video.get("width"), int)
+        self.height = _number(video.get("height"), int)
+
+    @property
+    def has_video(self) -> bool:
+        return self.video_codec is not None
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"MediaInfo({fields})"
+
+
+class ProbeService:
+    """
+    ffprobe run as asyncio subprocesses on the scheduler's probe slots.
+
+    Results are cached by path, size and mtime, so a file is re-probed only
+    once it changes; URLs are cached by address for ``PROBE_CACHE_TTL``
+    seconds.
+    """
+
+    def __init__(self):
+        self.cache = TTLCache(config.PROBE_CACHE_SIZE, config.PROBE_CACHE_TTL)
+        self.flights = SingleFlight()
+
+    @staticmethod
+    def _key(source: str):
+        try:
+            stat = os.stat(source)
+        except (OSError, TypeError, ValueError):
+            return (source, None, None)
+        return (source, stat.st_size, stat.st_mtime_ns)
+
+    async def _exec(self, source: str):
+        proc = await asyncio.create_subprocess_exec(
+            "ffprobe",
+            "-v",
+            "quiet",
+            "-print_format",
+            "json",
+            "-show_format",
+            "-show_streams",
+            source,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        try:
+            out, _ = await asyncio.wait_for(proc.communicate(), config.PROBE_TIMEOUT)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            LOGGER(__name__).warning(f"ffprobe of {source} timed out")
+            return None
+        except asyncio.CancelledError:
+            proc.kill()
+            raise
+        try:
+            return MediaInfo(json.loads(out or b"{}"))
+        except ValueError:
+            return None
+
+    async def probe(self, source: str):
+        """``MediaInfo`` for ``source``, or None if ffprobe could not run or read it."""
+        key = self._key(source)
+        info = self.cache.get(key)
+        if info is not None:
+            return info
+
+        async def run():
+            try:
+                info = await Probes.run(USER, "ffprobe", lambda: self._exec(source))
+            except Exception as e:
+                # ffprobe missing from PATH, cancelled with its chat, ...
+                LOGGER(__name__).warning(f"ffprobe of {source} failed: {e}")
+                return None
+            if info is not None:
+                self.cache.set(key, info)
+            return info
+
+        return await self.flights.do(key, run)
+
+    async def duration(self, source: str):
+        """Duration of ``source`` in seconds, or None when unknown."""
+        info = await self.probe(source)
+        return info.duration if info else None
+
+
+Probe = ProbeService()
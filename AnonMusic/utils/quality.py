@@ -0,0 +1,89 @@
+import asyncio
+
+from pytgcalls.types import AudioQuality, VideoQuality
+
+import config
+from AnonMusic.logging import LOGGER
+from AnonMusic.utils.database import get_quality
+from AnonMusic.utils.load import Load
+
+# Quality tiers, best first
+TIERS = ["high", "medium", "low"]
+PARAMETERS = {
+    "high": (AudioQuality.HIGH, VideoQuality.SD_480p),
+    "medium": (AudioQuality.MEDIUM, VideoQuality.SD_360p),
+    "low": (AudioQuality.LOW, VideoQuality.SD_360p),
+}
+
+
+class QualityController:
+    """
+    Picks the audio/video quality every new stream is built with.
+
+    A global level follows the load monitor's loop-lag and CPU samples: it
+    steps one tier down after ``QUALITY_STEP_SAMPLES`` hot samples in a row,
+    and back up after as many samples below the recovery ratio. A chat's
+    own setting caps its tier, so "low" stays low even on an idle host.
+    """
+
+    def __init__(self):
+        self.level = 0
+        self.applied = {}
+        self._hot = 0
+        self._calm = 0
+        self._task = None
+        self._on_change = None
+
+    def start(self, on_change=None):
+        self._on_change = on_change
+        if self._task is None and config.QUALITY_INTERVAL > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(config.QUALITY_INTERVAL)
+            if self._update() and self._on_change:
+                try:
+                    await self._on_change()
+                except Exception as e:
+                    LOGGER(__name__).warning(f"Failed to apply stream quality: {e}")
+
+    def _update(self) -> bool:
+        hot = Load.lag > config.QUALITY_LAG_THRESHOLD or Load.cpu > config.QUALITY_CPU_THRESHOLD
+        calm = (
+            Load.lag < config.QUALITY_LAG_THRESHOLD * config.LOAD_RECOVER_RATIO
+            and Load.cpu < config.QUALITY_CPU_THRESHOLD * config.LOAD_RECOVER_RATIO
+        )
+        self._hot = self._hot + 1 if hot else 0
+        self._calm = self._calm + 1 if calm else 0
+        level = self.level
+        if self._hot >= config.QUALITY_STEP_SAMPLES and level < len(TIERS) - 1:
+            level += 1
+        elif self._calm >= config.QUALITY_STEP_SAMPLES and level > 0:
+            level -= 1
+        if level == self.level:
+            return False
+        self._hot = self._calm = 0
+        LOGGER(__name__).info(
+            f"Stream quality {TIERS[self.level]} -> {TIERS[level]} "
+            f"(loop lag {Load.lag * 1000:.0f}ms, cpu {Load.cpu:.0f}%)"
+        )
+        self.level = level
+        return True
+
+    async def tier(self, chat_id: int) -> str:
+        """The tier ``chat_id`` should play at now."""
+        mode = await get_quality(chat_id)
+        level = self.level
+        if mode in TIERS:
+            level = max(level, TIERS.index(mode))
+        return TIERS[level]
+
+    async def parameters(self, chat_id: int):
+        """``(AudioQuality, VideoQuality)`` for a stream built for ``chat_id``."""
+        tier = await self.tier(chat_id)
+        self.applied[chat_id] = tier
+        return PARAMETERS[tier]
+
+
+Quality = QualityController()
@@ -0,0 +1,123 @@
+import asyncio
+import time
+
+import config
+from AnonMusic.core.metrics import Counter
+from AnonMusic.logging import LOGGER
+from AnonMusic.misc import db
+from AnonMusic.utils.database import get_active_chats, group_assistant, is_music_playing
+
+STALLS = Counter("anon_stream_stalls_total", "Streams that stopped progressing", ("backend",))
+RECOVERIES = Counter(
+    "anon_stream_recoveries_total",
+    "Actions taken on stalled streams",
+    ("backend", "action"),
+)
+
+
+def backend(track: dict) -> str:
+    file_path = str(track["file"])
+    if "live_" in file_path:
+        return "youtube_live"
+    if "vid_" in file_path:
+        return "youtube"
+    if "index_" in file_path:
+        return "index"
+    if file_path.startswith("http"):
+        return "url"
+    if track.get("vidid") in ("telegram", "soundcloud"):
+        return track["vidid"]
+    return "file"
+
+
+class _Watch:
+    __slots__ = ("track", "observed", "progressed", "attempts")
+
+    def __init__(self, track, observed):
+        self.track = track
+        self.observed = observed
+        self.progressed = time.monotonic()
+        self.attempts = 0
+
+
+class StallMonitor:
+    """
+    Notices calls whose stream stopped advancing and gets them playing again.
+
+    Every ``STALL_INTERVAL`` seconds the position pytgcalls reports for each
+    playing call is compared with the last one. A call that has not moved
+    for ``STALL_TIMEOUT`` seconds is restarted from where it stopped, with
+    its source resolved again; after ``STALL_RETRIES`` failed restarts the
+    queue moves on to the next track.
+    """
+
+    def __init__(self):
+        self.watches = {}
+        self._task = None
+        self._call = None
+
+    def start(self, call):
+        self._call = call
+        if self._task is None and config.STALL_INTERVAL > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(config.STALL_INTERVAL)
+            try:
+                await self._check()
+            except Exception as e:
+                LOGGER(__name__).warning(f"Stall check failed: {e}")
+
+    async def _check(self):
+        chats = list(await get_active_chats())
+        for chat_id in list(self.watches):
+            if chat_id not in chats:
+                self.watches.pop(chat_id, None)
+        for chat_id in chats:
+            playing = db.get(chat_id)
+            if not playing or not await is_music_playing(chat_id):
+                self.watches.pop(chat_id, None)
+                continue
+            observed = await self._call.played_time(chat_id)
+            if observed is None:
+                continue
+            watch = self.watches.get(chat_id)
+            if watch is None or watch.track is not playing[0]:
+                self.watches[chat_id] = _Watch(playing[0], observed)
+                continue
+            if observed != watch.observed:
+                watch.observed = observed
+                watch.progressed = time.monotonic()
+                watch.attempts = 0
+                continue
+            stalled = time.monotonic() - watch.progressed
+            if stalled >= config.STALL_TIMEOUT:
+                await self._recover(chat_id, playing[0], watch, stalled)
+
+    async def _recover(self, chat_id, track, watch, stalled):
+        name = backend(track)
+        STALLS.inc(backend=name)
+        watch.attempts += 1
+        watch.progressed = time.monotonic()
+        speed = float(track.get("speed") or 1.0)
+        position = max(0, int((int(track["played"]) - stalled) * speed))
+        if watch.attempts <= config.STALL_RETRIES:
+            LOGGER(__name__).warning(
+                f"Stream in {chat_id} ({name}) stalled for {stalled:.0f}s, restarting at {position}s"
+            )
+            try:
+                if await self._call.recover_stream(chat_id, position):
+                    track["played"] = int(position / speed)
+                    RECOVERIES.inc(backend=name, action="restart")
+                    return
+            except Exception as e:
+                LOGGER(__name__).warning(f"Failed to restart stream in {chat_id}: {e}")
+        LOGGER(__name__).warning(f"Giving up on stalled stream in {chat_id} ({name}), skipping")
+        RECOVERIES.inc(backend=name, action="skip")
+        self.watches.pop(chat_id, None)
+        assistant = await group_assistant(self._call, chat_id)
+        await self._call.change_stream(assistant, chat_id)
+
+
+Stalls = StallMonitor()
@@ -1,11 +1,13 @@
-import asyncio
 from typing import Union
 
 from AnonMusic.misc import db
-from AnonMusic.utils.formatters import check_duration, seconds_to_min
+from AnonMusic.utils.formatters import seconds_to_min
+from AnonMusic.utils.probe import Probe
+from AnonMusic.utils.tracing import traced
 from config import autoclean, time_to_seconds
 
 
+@traced("put_queue")
 async def put_queue(
     chat_id,
     original_chat_id,
@@ -47,6 +49,47 @@ async def put_queue(
     autoclean.append(file)
 
 
+@traced("put_queue")
+async def put_queue_many(
+    chat_id,
+    original_chat_id,
+    tracks,
+    user,
+    user_id,
+    stream,
+    forceplay: Union[bool, str] = None,
+):
+    """Enqueue ``tracks`` ([(file, title, duration, vidid), ...]) in order."""
+    puts = []
+    for file, title, duration, vidid in tracks:
+        try:
+            duration_in_seconds = time_to_seconds(duration) - 3
+        except:
+            duration_in_seconds = 0
+        puts.append(
+            {
+                "title": title.title(),
+                "dur": duration,
+                "streamtype": stream,
+                "by": user,
+                "user_id": user_id,
+                "chat_id": original_chat_id,
+                "file": file,
+                "vidid": vidid,
+                "seconds": duration_in_seconds,
+                "played": 0,
+            }
+        )
+    check = db.get(chat_id)
+    if check is None:
+        check = db[chat_id] = []
+    if forceplay:
+        check[0:0] = puts
+    else:
+        check.extend(puts)
+    autoclean.extend(x["file"] for x in puts)
+
+
 async def put_queue_index(
     chat_id,
     original_chat_id,
@@ -60,9 +103,7 @@ async def put_queue_index(
 ):
     if "20.212.146.162" in vidid:
         try:
-            dur = await asyncio.get_event_loop().run_in_executor(
-                None, check_duration, vidid
-            )
+            dur = int(await Probe.duration(vidid))
             duration = seconds_to_min(dur)
         except:
             duration = "ᴜʀʟ sᴛʀᴇᴀᴍ"
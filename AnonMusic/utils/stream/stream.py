@@ -11,11 +11,27 @@ from AnonMusic.misc import db
 from AnonMusic.utils.database import add_active_video_chat, is_active_chat
 from AnonMusic.utils.exceptions import AssistantErr
 from AnonMusic.utils.inline import aq_markup, close_markup, stream_markup
+from AnonMusic.utils.load import Load
+from AnonMusic.utils.outbound import PLAYBACK, REPLY, Outbound
 from AnonMusic.utils.pastebin import AnonyBin
-from AnonMusic.utils.stream.queue import put_queue, put_queue_index
+from AnonMusic.utils.stream.queue import put_queue, put_queue_index, put_queue_many
 from AnonMusic.utils.thumbnails import get_thumb
 
 
+async def _iterate(result):
+    """Walk a playlist given as a list or as an async generator of queries."""
+    if hasattr(result, "__aiter__"):
+        try:
+            async for item in result:
+                yield item
+        finally:
+            if hasattr(result, "aclose"):
+                await result.aclose()
+        return
+    for item in result:
+        yield item
+
+
 async def stream(
     _,
     mystic,
@@ -34,11 +50,12 @@ async def stream(
     if forceplay:
         await Anony.force_stop_stream(chat_id)
     if streamtype == "playlist":
-        msg = f"{_['play_19']}\n\n"
+        header = f"{_['play_19']}\n\n"
+        msg = header
         count = 0
-        for search in result:
+        async for search in _iterate(result):
             if int(count) == config.PLAYLIST_FETCH_LIMIT:
-                continue
+                break
             try:
                 (
                     title,
@@ -75,7 +92,7 @@ async def stream(
                 status = True if video else None
                 try:
                     file_path, direct = await YouTube.download(
-                        vidid, mystic, video=status, videoid=True
+                        vidid, mystic, video=status, videoid=True, chat_id=chat_id
                     )
                 except:
                     raise AssistantErr(_["play_14"])
@@ -100,7 +117,10 @@ async def stream(
                 )
                 img = await get_thumb(vidid)
                 button = stream_markup(_, chat_id)
-                run = await app.send_photo(
+                run = await Outbound.send(
+                    PLAYBACK,
+                    original_chat_id,
+                    app.send_photo,
                     original_chat_id,
                     photo=img,
                     caption=_["stream_1"].format(
@@ -116,15 +136,28 @@ async def stream(
         if count == 0:
             return
         else:
-            link = await AnonyBin(msg)
             lines = msg.count("\n")
             if lines >= 17:
                 car = os.linesep.join(msg.split(os.linesep)[:17])
             else:
                 car = msg
-            carbon = await Carbon.generate(car, randint(100, 10000000))
             upl = close_markup(_)
-            return await app.send_photo(
+            if Load.degraded:
+                body = os.linesep.join(msg[len(header) :].split(os.linesep)[:15])
+                return await Outbound.send(
+                    REPLY,
+                    original_chat_id,
+                    app.send_message,
+                    original_chat_id,
+                    text=_["play_23"].format(count, body),
+                    reply_markup=upl,
+                )
+            link = await AnonyBin(msg)
+            carbon = await Carbon.generate(car, randint(100, 10000000))
+            return await Outbound.send(
+                REPLY,
+                original_chat_id,
+                app.send_photo,
                 original_chat_id,
                 photo=carbon,
                 caption=_["play_21"].format(position, link),
@@ -139,7 +172,7 @@ async def stream(
         status = True if video else None
         try:
             file_path, direct = await YouTube.download(
-                vidid, mystic, videoid=True, video=status
+                vidid, mystic, videoid=True, video=status, chat_id=chat_id
             )
         except:
             raise AssistantErr(_["play_14"])
@@ -157,7 +190,10 @@ async def stream(
             )
             position = len(db.get(chat_id)) - 1
             button = aq_markup(_, chat_id)
-            await app.send_message(
+            await Outbound.send(
+                REPLY,
+                original_chat_id,
+                app.send_message,
                 chat_id=original_chat_id,
                 text=_["queue_4"].format(position, title[:27], duration_min, user_name),
                 reply_markup=InlineKeyboardMarkup(button),
@@ -186,7 +222,10 @@ async def stream(
             )
             img = await get_thumb(vidid)
             button = stream_markup(_, chat_id)
-            run = await app.send_photo(
+            run = await Outbound.send(
+                PLAYBACK,
+                original_chat_id,
+                app.send_photo,
                 original_chat_id,
                 photo=img,
                 caption=_["stream_1"].format(
@@ -217,7 +256,10 @@ async def stream(
             )
             position = len(db.get(chat_id)) - 1
             button = aq_markup(_, chat_id)
-            await app.send_message(
+            await Outbound.send(
+                REPLY,
+                original_chat_id,
+                app.send_message,
                 chat_id=original_chat_id,
                 text=_["queue_4"].format(position, title[:27], duration_min, user_name),
                 reply_markup=InlineKeyboardMarkup(button),
@@ -239,7 +281,10 @@ async def stream(
                 forceplay=forceplay,
             )
             button = stream_markup(_, chat_id)
-            run = await app.send_photo(
+            run = await Outbound.send(
+                PLAYBACK,
+                original_chat_id,
+                app.send_photo,
                 original_chat_id,
                 photo=config.SOUNCLOUD_IMG_URL,
                 caption=_["stream_1"].format(
@@ -269,7 +314,10 @@ async def stream(
             )
             position = len(db.get(chat_id)) - 1
             button = aq_markup(_, chat_id)
-            await app.send_message(
+            await Outbound.send(
+                REPLY,
+                original_chat_id,
+                app.send_message,
                 chat_id=original_chat_id,
                 text=_["queue_4"].format(position, title[:27], duration_min, user_name),
                 reply_markup=InlineKeyboardMarkup(button),
@@ -293,7 +341,10 @@ async def stream(
             if video:
                 await add_active_video_chat(chat_id)
             button = stream_markup(_, chat_id)
-            run = await app.send_photo(
+            run = await Outbound.send(
+                PLAYBACK,
+                original_chat_id,
+                app.send_photo,
                 original_chat_id,
                 photo=config.TELEGRAM_VIDEO_URL if video else config.TELEGRAM_AUDIO_URL,
                 caption=_["stream_1"].format(link, title[:23], duration_min, user_name),
@@ -322,7 +373,10 @@ async def stream(
             )
             position = len(db.get(chat_id)) - 1
             button = aq_markup(_, chat_id)
-            await app.send_message(
+            await Outbound.send(
+                REPLY,
+                original_chat_id,
+                app.send_message,
                 chat_id=original_chat_id,
                 text=_["queue_4"].format(position, title[:27], duration_min, user_name),
                 reply_markup=InlineKeyboardMarkup(button),
@@ -339,6 +393,7 @@ async def stream(
                 file_path,
                 video=status,
                 image=thumbnail if thumbnail else None,
+                live=True,
             )
             await put_queue(
                 chat_id,
@@ -354,7 +409,10 @@ async def stream(
             )
             img = await get_thumb(vidid)
             button = stream_markup(_, chat_id)
-            run = await app.send_photo(
+            run = await Outbound.send(
+                PLAYBACK,
+                original_chat_id,
+                app.send_photo,
                 original_chat_id,
                 photo=img,
                 caption=_["stream_1"].format(
@@ -409,7 +467,10 @@ async def stream(
                 forceplay=forceplay,
             )
             button = stream_markup(_, chat_id)
-            run = await app.send_photo(
+            run = await Outbound.send(
+                PLAYBACK,
+                original_chat_id,
+                app.send_photo,
                 original_chat_id,
                 photo=config.STREAM_IMG_URL,
                 caption=_["stream_2"].format(user_name),
@@ -418,3 +479,75 @@ async def stream(
             db[chat_id][0]["mystic"] = run
             db[chat_id][0]["markup"] = "tg"
             await mystic.delete()
+    elif streamtype == "batch":
+        status = True if video else None
+        tracks = [
+            (f"vid_{x['vidid']}", x["title"], x["duration_min"], x["vidid"])
+            for x in result
+        ]
+        first = result[0]
+        started = False
+        if not await is_active_chat(chat_id):
+            if not forceplay:
+                db[chat_id] = []
+            try:
+                file_path, direct = await YouTube.download(
+                    first["vidid"], mystic, videoid=True, video=status, chat_id=chat_id
+                )
+            except:
+                raise AssistantErr(_["play_14"])
+            await Anony.join_call(
+                chat_id,
+                original_chat_id,
+                file_path,
+                video=status,
+                image=first["thumb"],
+            )
+            if direct:
+                tracks[0] = (file_path,) + tracks[0][1:]
+            started = True
+        position = 0 if forceplay else len(db.get(chat_id) or [])
+        await put_queue_many(
+            chat_id,
+            original_chat_id,
+            tracks,
+            user_name,
+            user_id,
+            "video" if video else "audio",
+            forceplay=forceplay,
+        )
+        lines = ""
+        for count, x in enumerate(result):
+            lines += f"{position + count}. {x['title'].title()[:40]}\n"
+        summary = _["play_23"].format(len(result), lines[:600])
+        if started:
+            img = await get_thumb(first["vidid"])
+            button = stream_markup(_, chat_id)
+            run = await Outbound.send(
+                PLAYBACK,
+                original_chat_id,
+                app.send_photo,
+                original_chat_id,
+                photo=img,
+                caption=_["stream_1"].format(
+                    f"https://t.me/{app.username}?start=info_{first['vidid']}",
+                    first["title"].title()[:23],
+                    first["duration_min"],
+                    user_name,
+                )
+                + "\n\n"
+                + summary,
+                reply_markup=InlineKeyboardMarkup(button),
+            )
+            db[chat_id][0]["mystic"] = run
+            db[chat_id][0]["markup"] = "stream"
+        else:
+            button = aq_markup(_, chat_id)
+            await Outbound.send(
+                REPLY,
+                original_chat_id,
+                app.send_message,
+                original_chat_id,
+                text=summary,
+                reply_markup=InlineKeyboardMarkup(button),
+            )
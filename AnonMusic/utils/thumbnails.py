@@ -1,12 +1,15 @@
 import os
 import re
 import aiofiles
-import aiohttp
 import logging
 from PIL import Image, ImageDraw, ImageEnhance, ImageFilter, ImageFont, ImageOps
 from youtubesearchpython.__future__ import VideosSearch
 from config import YOUTUBE_IMG_URL
 from AnonMusic import app
+from AnonMusic.core.http import http
+from AnonMusic.core.metrics import THUMB_SECONDS
+from AnonMusic.utils.load import Load
+from AnonMusic.utils.tracing import traced
 
 # Logging Setup
 logging.basicConfig(level=logging.ERROR, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -53,11 +56,18 @@ def trim_to_width(text: str, font: ImageFont.FreeTypeFont, max_w: int) -> str:
     return ellipsis
 
 
+@traced("get_thumb")
 async def get_thumb(videoid: str) -> str:
     cache_path = os.path.join(CACHE_DIR, f"{videoid}_v5.png")
     if os.path.exists(cache_path):
         return cache_path
+    if Load.degraded:
+        return YOUTUBE_IMG_URL
+    with THUMB_SECONDS.time():
+        return await _render_thumb(videoid, cache_path)
+
 
+async def _render_thumb(videoid: str, cache_path: str) -> str:
     try:
         results = VideosSearch(f"https://www.youtube.com/watch?v={videoid}", limit=1)
         results_data = await results.next()
@@ -75,14 +85,13 @@ async def get_thumb(videoid: str) -> str:
 
     thumb_path = os.path.join(CACHE_DIR, f"thumb_{videoid}.jpg")
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(thumbnail) as resp:
-                if resp.status == 200:
-                    async with aiofiles.open(thumb_path, "wb") as f:
-                        await f.write(await resp.read())
-                else:
-                    logging.error(f"Failed to download thumbnail (HTTP {resp.status})")
-                    return YOUTUBE_IMG_URL
+        status, body = await http.fetch("GET", thumbnail, read="bytes")
+        if status == 200:
+            async with aiofiles.open(thumb_path, "wb") as f:
+                await f.write(body)
+        else:
+            logging.error(f"Failed to download thumbnail (HTTP {status})")
+            return YOUTUBE_IMG_URL
     except Exception as e:
         logging.error(f"Download error: {e}")
         return YOUTUBE_IMG_URL
@@ -0,0 +1,137 @@
+import asyncio
+import time
+from collections import OrderedDict
+
+from pyrogram.errors import FloodWait, MessageIdInvalid, MessageNotModified
+
+import config
+from AnonMusic.logging import LOGGER
+from AnonMusic.misc import db
+from AnonMusic.utils.database import get_active_chats, is_music_playing
+from AnonMusic.utils.formatters import seconds_to_min
+from AnonMusic.utils.load import Load
+from AnonMusic.utils.outbound import COSMETIC, Outbound
+
+
+class _Live:
+    __slots__ = ("message", "videoid", "render", "stamp")
+
+    def __init__(self, message, videoid, render):
+        self.message = message
+        self.videoid = videoid
+        self.render = render
+        self.stamp = None
+
+
+class ProgressTicker:
+    """
+    Owns every live progress message (``/queue``, ``/player`` ...).
+
+    A single task walks all registered messages once per interval and edits a
+    message only when its rendered timestamp changed. Chats that hit FloodWait
+    are backed off exponentially.
+    """
+
+    def __init__(self):
+        self.interval = config.PROGRESS_INTERVAL
+        self.max_per_chat = config.PROGRESS_MAX_PER_CHAT
+        self._live = {}
+        self._backoff = {}
+        self._strikes = {}
+        self._task = None
+
+    def register(self, chat_id: int, message, videoid, render):
+        """
+        Keep ``message`` updated while ``videoid`` plays in ``chat_id``.
+
+        ``render(playing)`` gets the current queue head and returns the markup.
+        """
+        messages = self._live.setdefault(chat_id, OrderedDict())
+        key = (message.chat.id, message.id)
+        messages.pop(key, None)
+        messages[key] = _Live(message, videoid, render)
+        while len(messages) > self.max_per_chat:
+            messages.popitem(last=False)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def unregister(self, message):
+        key = (message.chat.id, message.id)
+        for chat_id in list(self._live):
+            messages = self._live[chat_id]
+            messages.pop(key, None)
+            if not messages:
+                self._live.pop(chat_id, None)
+
+    def count(self) -> int:
+        return sum(len(x) for x in self._live.values())
+
+    async def _run(self):
+        while self._live:
+            interval = self.interval
+            if Load.degraded:
+                interval *= config.LOAD_PROGRESS_FACTOR
+            await asyncio.sleep(interval)
+            try:
+                await self._tick()
+            except Exception as e:
+                LOGGER(__name__).warning(f"Progress tick failed: {type(e).__name__}: {e}")
+
+    async def _tick(self):
+        active = set(await get_active_chats())
+        now = time.monotonic()
+        for chat_id in list(self._live):
+            messages = self._live[chat_id]
+            playing = db.get(chat_id)
+            if chat_id not in active or not playing:
+                self._live.pop(chat_id, None)
+                continue
+            head = playing[0]
+            for key, live in list(messages.items()):
+                if head["vidid"] != live.videoid:
+                    messages.pop(key, None)
+            if not messages:
+                self._live.pop(chat_id, None)
+                continue
+            if not await is_music_playing(chat_id):
+                continue
+            stamp = (seconds_to_min(head["played"]), head["dur"])
+            for key, live in list(messages.items()):
+                if live.stamp == stamp:
+                    continue
+                if self._backoff.get(key[0], 0) > now or Outbound.throttled(key[0]) > 0:
+                    continue
+                live.stamp = stamp
+                future = Outbound.submit(
+                    COSMETIC,
+                    key[0],
+                    live.message.edit_reply_markup,
+                    reply_markup=live.render(head),
+                    key=("markup",) + key,
+                )
+                future.add_done_callback(
+                    lambda f, chat_id=chat_id, key=key: self._edited(f, chat_id, key)
+                )
+
+    def _edited(self, future, chat_id, key):
+        if future.cancelled():
+            return
+        exc = future.exception()
+        if exc is None or isinstance(exc, MessageNotModified):
+            self._strikes.pop(key[0], None)
+            return
+        if isinstance(exc, FloodWait):
+            strikes = self._strikes.get(key[0], 0) + 1
+            self._strikes[key[0]] = strikes
+            delay = max(int(exc.value or 1), self.interval * 2**strikes)
+            self._backoff[key[0]] = time.monotonic() + delay
+            return
+        if isinstance(exc, MessageIdInvalid):
+            messages = self._live.get(chat_id)
+            if messages:
+                messages.pop(key, None)
+            return
+        LOGGER(__name__).debug(f"Progress edit failed: {type(exc).__name__}: {exc}")
+
+
+Ticker = ProgressTicker()
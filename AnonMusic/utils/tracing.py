@@ -0,0 +1,108 @@
+import functools
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import config
+from AnonMusic.core.metrics import Histogram
+from AnonMusic.logging import LOGGER
+
+STAGE_SECONDS = Histogram(
+    "anon_play_stage_seconds", "Duration of /play pipeline stages", ("stage",)
+)
+PLAY_SECONDS = Histogram("anon_play_seconds", "Total /play handling time")
+
+_current = ContextVar("anon_trace", default=None)
+
+
+class Trace:
+    __slots__ = ("chat_id", "user_id", "query", "started", "wall", "spans", "duration", "error")
+
+    def __init__(self, chat_id, user_id, query):
+        self.chat_id = chat_id
+        self.user_id = user_id
+        self.query = query
+        self.started = time.perf_counter()
+        self.wall = time.time()
+        self.spans = []
+        self.duration = None
+        self.error = None
+
+    def breakdown(self) -> str:
+        return ", ".join(
+            f"{stage}={elapsed:.2f}s" + (f"!{error}" if error else "")
+            for stage, _, elapsed, error in self.spans
+        )
+
+
+class PlayTracer:
+    """
+    Collects spans of one /play request and keeps the slow ones.
+
+    The active trace lives in a context variable, so every ``span`` awaited
+    from the handler (and tasks it spawns) lands in the same trace.
+    """
+
+    def __init__(self):
+        self.threshold = config.TRACE_SLOW_SECONDS
+        self.slow = deque(maxlen=config.TRACE_KEEP)
+        self.total = 0
+
+    @contextmanager
+    def trace(self, chat_id, user_id, query):
+        trace = Trace(chat_id, user_id, query)
+        token = _current.set(trace)
+        try:
+            yield trace
+        except BaseException as e:
+            trace.error = type(e).__name__
+            raise
+        finally:
+            _current.reset(token)
+            self._finish(trace)
+
+    def _finish(self, trace):
+        trace.duration = time.perf_counter() - trace.started
+        self.total += 1
+        PLAY_SECONDS.observe(trace.duration)
+        if trace.duration < self.threshold:
+            return
+        self.slow.append(trace)
+        LOGGER(__name__).warning(
+            f"Slow /play {trace.duration:.2f}s in {trace.chat_id} by {trace.user_id}: "
+            f"{trace.breakdown() or 'no spans'}"
+        )
+
+
+@contextmanager
+def span(stage: str):
+    """Time ``stage`` into the stage histogram and the active trace, if any."""
+    trace = _current.get()
+    started = time.perf_counter()
+    error = None
+    try:
+        yield
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        STAGE_SECONDS.observe(elapsed, stage=stage)
+        if trace is not None and trace.duration is None:
+            trace.spans.append((stage, started - trace.started, elapsed, error))
+
+
+def traced(stage: str):
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with span(stage):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+Tracer = PlayTracer()
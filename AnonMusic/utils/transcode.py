@@ -0,0 +1,144 @@
+import asyncio
+import heapq
+import itertools
+import os
+import time
+
+import config
+from AnonMusic.core.metrics import Histogram
+from AnonMusic.logging import LOGGER
+from AnonMusic.utils.load import Load
+
+# Priority classes, lower value starts first
+LIVE = 0
+USER = 1
+BACKGROUND = 2
+
+CLASS_NAMES = ["live", "user", "background"]
+
+JOB_SECONDS = Histogram(
+    "anon_transcode_seconds",
+    "Run time of ffmpeg jobs",
+    ("kind",),
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600),
+)
+JOB_WAIT_SECONDS = Histogram(
+    "anon_transcode_wait_seconds", "Time ffmpeg jobs spent queued", ("priority",)
+)
+
+
+class TranscodeCancelled(Exception):
+    pass
+
+
+class TranscodeScheduler:
+    """
+    Admission gate for the bot's own ffmpeg and ffprobe work.
+
+    ``Jobs`` gates yt-dlp downloads together with the ffmpeg merges and
+    conversions they run; ``Probes`` gates ffprobe runs on a separate, light
+    set of slots so short probes never queue behind long downloads. The
+    ffmpeg decoders pytgcalls starts for the calls themselves are not gated.
+
+    At most ``workers`` jobs run at once, and only one job outside the live
+    class while the bot is degraded. Waiting jobs start by priority class,
+    then in arrival order. Jobs tagged with a chat are cancelled by
+    ``cancel_chat`` once that chat's stream ends; a cancelled job keeps its
+    slot until its work has actually stopped.
+    """
+
+    def __init__(self, workers: int = 0):
+        self.workers = workers or max(1, (os.cpu_count() or 2) // 2)
+        self.active = 0
+        self.jobs = {}
+        self.completed = [0] * len(CLASS_NAMES)
+        self.cancelled = 0
+        self._waiting = []
+        self._seq = itertools.count()
+
+    def _limit(self, priority: int) -> int:
+        if Load.degraded and priority != LIVE:
+            return 1
+        return self.workers
+
+    def _admit(self):
+        while self._waiting:
+            priority, _, future, _ = self._waiting[0]
+            if future.done():
+                heapq.heappop(self._waiting)
+                continue
+            if self.active >= self._limit(priority):
+                break
+            heapq.heappop(self._waiting)
+            self.active += 1
+            future.set_result(None)
+
+    def _release(self):
+        self.active -= 1
+        self._admit()
+
+    def queue_depth(self) -> dict:
+        depth = {name: 0 for name in CLASS_NAMES}
+        for priority, _, future, _ in self._waiting:
+            if not future.done():
+                depth[CLASS_NAMES[priority]] += 1
+        return depth
+
+    async def run(self, priority: int, kind: str, factory, chat_id=None):
+        """
+        Run ``factory()`` once a slot of ``priority`` is free and return its result.
+
+        Raises TranscodeCancelled if ``chat_id``'s stream ends first.
+        """
+        queued = time.monotonic()
+        if self._waiting or self.active >= self._limit(priority):
+            future = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._waiting, (priority, next(self._seq), future, chat_id))
+            self._admit()
+            try:
+                await future
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    self._release()
+                raise
+        else:
+            self.active += 1
+        JOB_WAIT_SECONDS.observe(time.monotonic() - queued, priority=CLASS_NAMES[priority])
+        job = asyncio.ensure_future(factory())
+        self.jobs[job] = (priority, chat_id, kind)
+        started = time.monotonic()
+        try:
+            return await asyncio.shield(job)
+        except asyncio.CancelledError:
+            if not job.done():
+                job.cancel()
+                await asyncio.wait({job})
+            if job.cancelled() and self.jobs.get(job) is None:
+                raise TranscodeCancelled(f"{kind} job for {chat_id} cancelled")
+            raise
+        finally:
+            if self.jobs.pop(job, None) is not None:
+                self.completed[priority] += 1
+            JOB_SECONDS.observe(time.monotonic() - started, kind=kind)
+            self._release()
+
+    def cancel_chat(self, chat_id):
+        """Drop queued jobs and stop running ones requested for ``chat_id``."""
+        count = 0
+        for _, _, future, owner in self._waiting:
+            if owner == chat_id and not future.done():
+                future.set_exception(TranscodeCancelled(f"Job for {chat_id} cancelled"))
+                count += 1
+        for job, entry in list(self.jobs.items()):
+            if entry and entry[1] == chat_id:
+                self.jobs[job] = None
+                job.cancel()
+                count += 1
+        if count:
+            self.cancelled += count
+            LOGGER(__name__).info(f"Cancelled {count} transcode jobs of {chat_id}")
+            self._admit()
+
+
+Jobs = TranscodeScheduler(config.TRANSCODE_WORKERS)
+Probes = TranscodeScheduler(config.PROBE_WORKERS)
@@ -0,0 +1,133 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+
+import config
+from AnonMusic.logging import LOGGER
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class _Offender:
+    __slots__ = ("where", "leaf", "stack", "stalls", "blocked", "worst")
+
+    def __init__(self, where, leaf, stack):
+        self.where = where
+        self.leaf = leaf
+        self.stack = stack
+        self.stalls = 0
+        self.blocked = 0.0
+        self.worst = 0.0
+
+
+class LoopWatchdog:
+    """
+    Detects coroutines that block the event loop.
+
+    A heartbeat task stamps the time on every loop iteration it gets. A
+    daemon thread checks that stamp and, once it is older than
+    ``WATCHDOG_THRESHOLD``, samples the loop thread's stack and charges the
+    stall to the innermost frame from this package.
+    """
+
+    def __init__(self):
+        self.threshold = config.WATCHDOG_THRESHOLD
+        self.offenders = {}
+        self.stalls = 0
+        self._beat = time.monotonic()
+        self._loop_thread = None
+        self._thread = None
+        self._task = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        if not self.threshold or (self._task and not self._task.done()):
+            return
+        self._loop_thread = threading.get_ident()
+        self._beat = time.monotonic()
+        self._task = asyncio.create_task(self._heartbeat())
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._watch, name="loop-watchdog", daemon=True
+            )
+            self._thread.start()
+
+    async def _heartbeat(self):
+        step = self.threshold / 4
+        while True:
+            self._beat = time.monotonic()
+            await asyncio.sleep(step)
+
+    def _watch(self):
+        step = self.threshold / 4
+        stalled_since = None
+        offender = None
+        while True:
+            time.sleep(step)
+            now = time.monotonic()
+            late = now - self._beat
+            if late < self.threshold:
+                if stalled_since is not None and offender is not None:
+                    self._finished(offender, now - stalled_since)
+                stalled_since, offender = None, None
+                continue
+            if stalled_since is None:
+                stalled_since = self._beat
+                offender = self._sample()
+
+    def _sample(self):
+        frame = sys._current_frames().get(self._loop_thread)
+        if frame is None:
+            return None
+        stack = traceback.extract_stack(frame)
+        if not stack:
+            return None
+        leaf = stack[-1]
+        where = leaf
+        for entry in reversed(stack):
+            if entry.filename.startswith(_ROOT) and entry.filename != __file__:
+                where = entry
+                break
+        key = (where.filename, where.lineno, where.name)
+        with self._lock:
+            offender = self.offenders.get(key)
+            if offender is None:
+                offender = self.offenders[key] = _Offender(
+                    _describe(where), _describe(leaf), traceback.format_list(stack[-8:])
+                )
+        return offender
+
+    def _finished(self, offender, duration):
+        with self._lock:
+            offender.stalls += 1
+            offender.blocked += duration
+            offender.worst = max(offender.worst, duration)
+            self.stalls += 1
+        LOGGER(__name__).warning(
+            f"Event loop blocked for {duration:.2f}s at {offender.where} (in {offender.leaf})"
+        )
+
+    def report(self, limit: int = 10) -> list:
+        with self._lock:
+            offenders = sorted(
+                self.offenders.values(), key=lambda x: x.blocked, reverse=True
+            )
+        return [x for x in offenders if x.stalls][:limit]
+
+    def reset(self):
+        with self._lock:
+            self.offenders.clear()
+            self.stalls = 0
+
+
+def _describe(entry) -> str:
+    filename = os.path.relpath(entry.filename, os.path.dirname(_ROOT))
+    if filename.startswith(".."):
+        filename = os.path.basename(entry.filename)
+    return f"{filename}:{entry.lineno} {entry.name}"
+
+
+Watchdog = LoopWatchdog()
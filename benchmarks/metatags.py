@@ -0,0 +1,92 @@
+"""
+Streaming meta-tag extraction against the old full BeautifulSoup parse.
+
+Run from the repository root:
+
+    python benchmarks/metatags.py [rounds]
+
+The fixtures are Apple Music track/playlist and Resso track pages saved
+under ``benchmarks/fixtures``. The old path needs ``beautifulsoup4``.
+"""
+import importlib.util
+import os
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(ROOT, "benchmarks", "fixtures")
+CHUNK_SIZE = 8192
+
+# Loaded by path: importing the AnonMusic package would start the bot.
+_spec = importlib.util.spec_from_file_location(
+    "metatags", os.path.join(ROOT, "AnonMusic", "utils", "metatags.py")
+)
+metatags = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(metatags)
+
+try:
+    from bs4 import BeautifulSoup
+except ImportError:
+    BeautifulSoup = None
+
+CASES = [
+    ("apple_track.html", ["og:title"], ["og:title"]),
+    ("apple_playlist.html", ["music:song"], []),
+    ("resso_track.html", ["og:title", "og:description"], ["og:title", "og:description"]),
+]
+
+
+def streaming(page: bytes, properties, enough):
+    """What ``meta_reader`` does with a response, returning (found, bytes read)."""
+    parser = metatags.MetaExtractor(properties, enough, "utf-8")
+    read = 0
+    for start in range(0, len(page), CHUNK_SIZE):
+        chunk = page[start : start + CHUNK_SIZE]
+        read += len(chunk)
+        if parser.feed_bytes(chunk):
+            break
+    else:
+        parser.feed_bytes(b"", final=True)
+    return parser.found, read
+
+
+def full_parse(page: bytes, properties):
+    """The previous Apple/Resso code path: decode everything, soup every tag."""
+    soup = BeautifulSoup(page.decode("utf-8"), "html.parser")
+    found = {}
+    for tag in soup.find_all("meta"):
+        prop = tag.get("property", None)
+        if prop in properties:
+            found.setdefault(prop, []).append(tag.get("content", None))
+    return found
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    if BeautifulSoup is None:
+        print("beautifulsoup4 is not installed, timing the streaming path only\n")
+    print(f"{'page':<22}{'size':>10}{'read':>10}{'stream ms':>12}{'soup ms':>10}{'speedup':>9}")
+    for name, properties, enough in CASES:
+        with open(os.path.join(FIXTURES, name), "rb") as f:
+            page = f.read()
+        found, read = streaming(page, properties, enough)
+        stream_ms = timeit.timeit(lambda: streaming(page, properties, enough), number=rounds)
+        stream_ms = stream_ms * 1000 / rounds
+        soup_ms = speedup = "-"
+        if BeautifulSoup is not None:
+            expected = full_parse(page, properties)
+            if not enough:
+                assert found == expected, f"{name}: {found} != {expected}"
+            else:
+                assert all(found[p][0] in expected[p] for p in enough), name
+            soup = timeit.timeit(lambda: full_parse(page, properties), number=rounds)
+            soup = soup * 1000 / rounds
+            soup_ms, speedup = f"{soup:.2f}", f"{soup / stream_ms:.1f}x"
+        print(
+            f"{name:<22}{len(page) // 1024:>9}K{read // 1024:>9}K"
+            f"{stream_ms:>12.2f}{soup_ms:>10}{speedup:>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
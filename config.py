@@ -63,6 +63,7 @@ AUTO_END_STREAM = bool(getenv("AUTO_END_STREAM", False))
 # Spotify credentials (from https://developer.spotify.com/dashboard)
 SPOTIFY_CLIENT_ID = getenv("SPOTIFY_CLIENT_ID", "22b6125bfe224587b722d6815002db2b")
 SPOTIFY_CLIENT_SECRET = getenv("SPOTIFY_CLIENT_SECRET", "c9c63c6fbf2f467c8bc68624851e9773")
+SPOTIFY_PAGE_CONCURRENCY = int(getenv("SPOTIFY_PAGE_CONCURRENCY", 4))  # Playlist pages fetched at once
 
 # Playlist track fetch limit
 PLAYLIST_FETCH_LIMIT = int(getenv("PLAYLIST_FETCH_LIMIT", 25))
@@ -71,6 +72,121 @@ PLAYLIST_FETCH_LIMIT = int(getenv("PLAYLIST_FETCH_LIMIT", 25))
 TG_AUDIO_FILESIZE_LIMIT = int(getenv("TG_AUDIO_FILESIZE_LIMIT", 204857600))  # ~195 MB
 TG_VIDEO_FILESIZE_LIMIT = int(getenv("TG_VIDEO_FILESIZE_LIMIT", 2073741824))  # ~1.93 GB
 
+# Outbound request scheduler (bot send/edit calls)
+OUTBOUND_GLOBAL_RATE = int(getenv("OUTBOUND_GLOBAL_RATE", 25))  # Calls per second across all chats
+OUTBOUND_CHAT_INTERVAL = float(getenv("OUTBOUND_CHAT_INTERVAL", 1.0))  # Seconds between calls to one chat
+OUTBOUND_MAX_RETRIES = int(getenv("OUTBOUND_MAX_RETRIES", 2))  # Retries of a call after FloodWait
+
+# Live progress bars (/queue, /player)
+PROGRESS_INTERVAL = int(getenv("PROGRESS_INTERVAL", 5))  # Seconds between progress updates
+PROGRESS_MAX_PER_CHAT = int(getenv("PROGRESS_MAX_PER_CHAT", 2))  # Live progress messages kept per chat
+
+# Admission control for /play and search (token buckets: burst size, tokens per second)
+ADMISSION_USER_BURST = float(getenv("ADMISSION_USER_BURST", 5))
+ADMISSION_USER_RATE = float(getenv("ADMISSION_USER_RATE", 0.2))
+ADMISSION_CHAT_BURST = float(getenv("ADMISSION_CHAT_BURST", 15))
+ADMISSION_CHAT_RATE = float(getenv("ADMISSION_CHAT_RATE", 0.5))
+ADMISSION_GLOBAL_BURST = float(getenv("ADMISSION_GLOBAL_BURST", 60))
+ADMISSION_GLOBAL_RATE = float(getenv("ADMISSION_GLOBAL_RATE", 10))
+ADMISSION_INLINE_BURST = float(getenv("ADMISSION_INLINE_BURST", 20))  # Inline queries use their own per-user bucket
+ADMISSION_INLINE_RATE = float(getenv("ADMISSION_INLINE_RATE", 1))
+ADMISSION_INLINE_GLOBAL_BURST = float(getenv("ADMISSION_INLINE_GLOBAL_BURST", 100))  # Bot-wide inline budget, apart from /play
+ADMISSION_INLINE_GLOBAL_RATE = float(getenv("ADMISSION_INLINE_GLOBAL_RATE", 20))
+ADMISSION_COSTS = getenv("ADMISSION_COSTS", "play=1,search=1,telegram=3,inline=1")  # Tokens per operation
+ADMISSION_MAX_TRACKED = int(getenv("ADMISSION_MAX_TRACKED", 10000))  # Buckets kept before idle ones are pruned
+
+# Load shedding (degraded mode skips thumbnails, carbon, pastes and play logs)
+LOAD_SAMPLE_INTERVAL = float(getenv("LOAD_SAMPLE_INTERVAL", 1.0))  # Seconds between load samples
+LOAD_LAG_THRESHOLD = float(getenv("LOAD_LAG_THRESHOLD", 0.25))  # Event-loop lag in seconds
+LOAD_CPU_THRESHOLD = float(getenv("LOAD_CPU_THRESHOLD", 90))  # Host CPU percent
+LOAD_RECOVER_RATIO = float(getenv("LOAD_RECOVER_RATIO", 0.6))  # Fraction of thresholds to recover below
+LOAD_RECOVER_SAMPLES = int(getenv("LOAD_RECOVER_SAMPLES", 10))  # Calm samples needed to recover
+LOAD_PROGRESS_FACTOR = int(getenv("LOAD_PROGRESS_FACTOR", 3))  # Progress interval multiplier while degraded
+
+# Metrics and health probes (/metrics, /healthz, /readyz), 0 disables the server
+METRICS_HOST = getenv("METRICS_HOST", "0.0.0.0")
+METRICS_PORT = int(getenv("METRICS_PORT", 0))
+HEALTH_MAX_LAG = float(getenv("HEALTH_MAX_LAG", 10))  # Loop lag in seconds before liveness fails
+HEALTH_MONGO_TTL = float(getenv("HEALTH_MONGO_TTL", 5))  # Seconds a Mongo ping result is reused
+HEALTH_MONGO_TIMEOUT = float(getenv("HEALTH_MONGO_TIMEOUT", 2))  # Mongo ping timeout in seconds
+
+# /play tracing
+TRACE_SLOW_SECONDS = float(getenv("TRACE_SLOW_SECONDS", 8))  # Plays slower than this are logged
+TRACE_KEEP = int(getenv("TRACE_KEEP", 20))  # Slow plays kept for /trace
+
+# Event-loop watchdog, 0 disables it
+WATCHDOG_THRESHOLD = float(getenv("WATCHDOG_THRESHOLD", 0.5))  # Seconds the loop may stall before sampling
+
+# Spotify/Apple/Resso -> YouTube match cache
+MATCH_CACHE_SIZE = int(getenv("MATCH_CACHE_SIZE", 5000))  # Matches kept in memory
+MATCH_CACHE_TTL = int(getenv("MATCH_CACHE_TTL", 7 * 24 * 3600))  # Seconds a match stays valid
+MATCH_STORE_MAX = int(getenv("MATCH_STORE_MAX", 100000))  # Matches kept in Mongo, oldest dropped first
+
+# Free-text search cache for /play and the slider
+SEARCH_CACHE_SIZE = int(getenv("SEARCH_CACHE_SIZE", 1000))  # Queries kept in memory
+SEARCH_CACHE_TTL = int(getenv("SEARCH_CACHE_TTL", 600))  # Seconds a result list is reused
+
+# Shared HTTP session
+HTTP_POOL_LIMIT = int(getenv("HTTP_POOL_LIMIT", 100))  # Open connections in total
+HTTP_POOL_PER_HOST = int(getenv("HTTP_POOL_PER_HOST", 10))  # Open connections per host
+HTTP_DNS_TTL = int(getenv("HTTP_DNS_TTL", 300))  # Seconds DNS answers are cached
+HTTP_TIMEOUT = float(getenv("HTTP_TIMEOUT", 20))  # Default total timeout per request
+HTTP_CONNECT_TIMEOUT = float(getenv("HTTP_CONNECT_TIMEOUT", 5))
+HTTP_RETRIES = int(getenv("HTTP_RETRIES", 2))  # Retries of GET requests on errors, 429 and 5xx
+HTTP_HOST_TIMEOUTS = getenv(
+    "HTTP_HOST_TIMEOUTS",
+    "api.spotify.com=10,accounts.spotify.com=10,batbin.me=10,carbonara.solopov.dev=30",
+)  # Per-host total timeouts
+
+# yt-dlp extraction worker pool
+EXTRACT_WORKERS = int(getenv("EXTRACT_WORKERS", 2))  # Worker processes running extractions
+EXTRACT_MAX_JOBS = int(getenv("EXTRACT_MAX_JOBS", 50))  # Jobs before a worker is recycled
+EXTRACT_TIMEOUT = float(getenv("EXTRACT_TIMEOUT", 60))  # Seconds allowed for an info extraction
+EXTRACT_DOWNLOAD_TIMEOUT = float(getenv("EXTRACT_DOWNLOAD_TIMEOUT", 600))  # Seconds allowed for a download
+EXTRACT_CACHE_SIZE = int(getenv("EXTRACT_CACHE_SIZE", 256))  # Info dicts kept in memory
+EXTRACT_CACHE_TTL = int(getenv("EXTRACT_CACHE_TTL", 1800))  # Seconds an info dict is reused
+
+# Local media store for downloaded tracks
+MEDIA_STORE_DIR = getenv("MEDIA_STORE_DIR", "downloads/store")  # Stored files and their index
+MEDIA_STORE_MAX_MB = int(getenv("MEDIA_STORE_MAX_MB", 2048))  # Size above which old files are evicted
+TG_DOWNLOAD_RETRIES = int(getenv("TG_DOWNLOAD_RETRIES", 3))  # Resumed attempts of a broken Telegram download
+TG_PROGRESSIVE_BUFFER = int(getenv("TG_PROGRESSIVE_BUFFER", 8 * 1024 * 1024))  # Bytes on disk before playback starts
+TG_PROGRESSIVE_IDLE = float(getenv("TG_PROGRESSIVE_IDLE", 10))  # Seconds ffmpeg waits for more data of a partial file
+
+# Adaptive stream quality
+QUALITY_INTERVAL = float(getenv("QUALITY_INTERVAL", 15))  # Seconds between quality decisions, 0 disables
+QUALITY_LAG_THRESHOLD = float(getenv("QUALITY_LAG_THRESHOLD", 0.1))  # Loop lag that steps quality down
+QUALITY_CPU_THRESHOLD = float(getenv("QUALITY_CPU_THRESHOLD", 75))  # CPU percent that steps quality down
+QUALITY_STEP_SAMPLES = int(getenv("QUALITY_STEP_SAMPLES", 4))  # Samples in a row before changing tier
+QUALITY_RESTART_GAP = float(getenv("QUALITY_RESTART_GAP", 0.5))  # Seconds between re-tiered streams
+
+# ffmpeg input options for remote streams
+REMOTE_RECONNECT_DELAY_MAX = int(getenv("REMOTE_RECONNECT_DELAY_MAX", 5))  # Longest backoff between reconnects
+REMOTE_RW_TIMEOUT = float(getenv("REMOTE_RW_TIMEOUT", 15))  # Seconds a read may block before reconnecting
+REMOTE_QUEUE_SIZE = int(getenv("REMOTE_QUEUE_SIZE", 2048))  # Packets buffered ahead of the decoder
+REMOTE_PROBESIZE = int(getenv("REMOTE_PROBESIZE", 10000000))  # Bytes read to detect the stream format
+REMOTE_ANALYZEDURATION = int(getenv("REMOTE_ANALYZEDURATION", 10000000))  # Microseconds analysed to detect streams
+
+# Live stream URL refresh
+LIVE_REFRESH_MARGIN = int(getenv("LIVE_REFRESH_MARGIN", 600))  # Seconds before a live URL expires to resolve it again
+LIVE_REFRESH_MIN = int(getenv("LIVE_REFRESH_MIN", 60))  # Shortest wait between refreshes
+LIVE_REFRESH_INTERVAL = int(getenv("LIVE_REFRESH_INTERVAL", 10800))  # Refresh period when the URL carries no expiry, 0 disables
+LIVE_REFRESH_RETRY = int(getenv("LIVE_REFRESH_RETRY", 30))  # Seconds before retrying a failed refresh
+
+# Stalled stream recovery
+STALL_INTERVAL = float(getenv("STALL_INTERVAL", 5))  # Seconds between progress checks, 0 disables
+STALL_TIMEOUT = float(getenv("STALL_TIMEOUT", 20))  # Seconds without progress before a stream is restarted
+STALL_RETRIES = int(getenv("STALL_RETRIES", 2))  # Restarts of one track before skipping it
+
+# ffmpeg / ffprobe job scheduler
+TRANSCODE_WORKERS = int(getenv("TRANSCODE_WORKERS", 0))  # Concurrent jobs, 0 for half the CPU cores
+
+# ffprobe service
+PROBE_TIMEOUT = float(getenv("PROBE_TIMEOUT", 30))  # Seconds before a probe is killed
+PROBE_WORKERS = int(getenv("PROBE_WORKERS", 4))  # Concurrent probes, gated apart from transcodes
+PROBE_CACHE_SIZE = int(getenv("PROBE_CACHE_SIZE", 512))  # Probe results kept in memory
+PROBE_CACHE_TTL = int(getenv("PROBE_CACHE_TTL", 3600))  # Seconds a probe result is reused
+
 # Private mode memory limit
 PRIVATE_BOT_MODE_MEM = int(getenv("PRIVATE_BOT_MODE_MEM", 1))
 
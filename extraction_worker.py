@@ -0,0 +1,40 @@
+"""
+yt-dlp worker process for AnonMusic.utils.extractor.
+
+Kept outside the AnonMusic package so the forkserver can preload it
+without importing the bot, its clients or its event loop.
+"""
+import os
+import signal
+
+from yt_dlp import YoutubeDL
+
+
+def serve(conn):
+    """Worker process loop: run yt-dlp jobs received over ``conn`` until told to stop."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # Own process group, so killing a job also stops the ffmpeg it spawned.
+    os.setpgrp()
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            break
+        if job is None:
+            break
+        url, opts, download, info = job
+        try:
+            with YoutubeDL(opts) as ydl:
+                if info is None:
+                    info = ydl.extract_info(url, download=download)
+                else:
+                    # Already extracted by an earlier info job: only pick
+                    # formats and download.
+                    info = ydl.process_ie_result(info, download=download)
+                info = ydl.sanitize_info(info)
+                if download and info:
+                    requested = info.get("requested_downloads") or [{}]
+                    info["filepath"] = requested[0].get("filepath") or ydl.prepare_filename(info)
+            conn.send((True, info))
+        except Exception as e:
+            conn.send((False, f"{type(e).__name__}: {e}"))